@@ -1,437 +1,593 @@
-import streamlit as st
-import numpy as np
-import pandas as pd
-import plotly.graph_objs as go
-from plotly.subplots import make_subplots
-import time
-
-# -------------------------
-# Page Replacement Functions
-# -------------------------
-def fifo_page_replacement(pages, capacity):
-    frame = []
-    page_faults = 0
-    steps = []
-    hit_miss = []
-    response_times = []
-    
-    start_time = time.time()
-    for page in pages:
-        req_time = time.time()
-        if page not in frame:
-            if len(frame) < capacity:
-                frame.append(page)
-            else:
-                frame.pop(0)
-                frame.append(page)
-            page_faults += 1
-            hit_miss.append("Miss")
-        else:
-            hit_miss.append("Hit")
-        steps.append(list(frame))
-        response_times.append(time.time() - req_time)
-    
-    execution_time = time.time() - start_time
-    memory_utilization = (len(set(pages)) / capacity) * 100
-    return page_faults, steps, hit_miss, execution_time, response_times, memory_utilization
-
-def lru_page_replacement(pages, capacity):
-    frame = []
-    page_faults = 0
-    steps = []
-    hit_miss = []
-    response_times = []
-    
-    start_time = time.time()
-    for page in pages:
-        req_time = time.time()
-        if page not in frame:
-            if len(frame) < capacity:
-                frame.append(page)
-            else:
-                frame.pop(0)
-                frame.append(page)
-            page_faults += 1
-            hit_miss.append("Miss")
-        else:
-            frame.remove(page)
-            frame.append(page)
-            hit_miss.append("Hit")
-        steps.append(list(frame))
-        response_times.append(time.time() - req_time)
-    
-    execution_time = time.time() - start_time
-    memory_utilization = (len(set(pages)) / capacity) * 100
-    return page_faults, steps, hit_miss, execution_time, response_times, memory_utilization
-
-def optimal_page_replacement(pages, capacity):
-    frame = []
-    page_faults = 0
-    steps = []
-    hit_miss = []
-    response_times = []
-    
-    start_time = time.time()
-    for i, page in enumerate(pages):
-        req_time = time.time()
-        if page not in frame:
-            if len(frame) < capacity:
-                frame.append(page)
-            else:
-                future_pages = pages[i+1:]
-                farthest = -1
-                index_to_replace = 0
-                for index, f_page in enumerate(frame):
-                    if f_page in future_pages:
-                        next_use = future_pages.index(f_page)
-                        if next_use > farthest:
-                            farthest = next_use
-                            index_to_replace = index
-                    else:
-                        index_to_replace = index
-                        break
-                frame[index_to_replace] = page
-            page_faults += 1
-            hit_miss.append("Miss")
-        else:
-            hit_miss.append("Hit")
-        steps.append(list(frame))
-        response_times.append(time.time() - req_time)
-    
-    execution_time = time.time() - start_time
-    memory_utilization = (len(set(pages)) / capacity) * 100
-    return page_faults, steps, hit_miss, execution_time, response_times, memory_utilization
-
-# -------------------------
-# Concepts Explanation Function
-# -------------------------
-def generate_concepts_explanation(algorithm, pages, capacity, faults):
-    explanation = f"## Concepts Covered: {algorithm} Page Replacement Algorithm\n\n"
-    explanation += "### Algorithm Overview\n"
-    explanation += f"The simulation used a page reference string of {len(pages)} pages with a frame capacity of {capacity}.\n\n"
-    
-    if algorithm == "FIFO":
-        explanation += """
-#### First-In-First-Out (FIFO) Page Replacement
-
-FIFO is the simplest page replacement algorithm:
-- New pages are added to the end of the frame
-- When frames are full, the oldest page (first one added) is removed
-- Works like a queue: first page in is the first to be replaced
-
-**Key Characteristics:**
-- Simple to implement
-- Doesn't consider page usage frequency
-- Can suffer from Belady's anomaly (more frames can increase page faults)
-"""
-    
-    elif algorithm == "LRU":
-        explanation += """
-#### Least Recently Used (LRU) Page Replacement
-
-LRU tracks the order of page usage more intelligently:
-- Most recently used page moves to the end of the frame list
-- When frames are full, the least recently used page is removed
-- Assumes recently used pages are more likely to be used again
-
-**Key Characteristics:**
-- More adaptive than FIFO
-- Considers recent page access patterns
-- Requires tracking page usage order
-"""
-    
-    elif algorithm == "Optimal":
-        explanation += """
-#### Optimal Page Replacement
-
-Optimal algorithm makes the most theoretically efficient replacement:
-- Replaces the page that won't be used for the longest time in the future
-- Looks ahead in the page reference string to make the best replacement decision
-- Impossible to implement perfectly in real systems, but serves as a theoretical benchmark
-
-**Key Characteristics:**
-- Minimizes page faults
-- Requires future knowledge of page references
-- Used as a theoretical ideal for comparing other algorithms
-"""
-    
-    total_pages = len(pages)
-    unique_pages = len(set(pages))
-    fault_percentage = (faults / total_pages) * 100
-    hit_percentage = 100 - fault_percentage
-    
-    explanation += f"\n### Performance Insights\n"
-    explanation += f"""
-- **Total Pages Processed:** {total_pages}
-- **Unique Pages in Reference String:** {unique_pages}
-- **Frame Capacity:** {capacity}
-- **Page Fault Rate:** {fault_percentage:.2f}%
-- **Page Hit Rate:** {hit_percentage:.2f}%
-
-### Interpretation
-The performance depends on:
-1. Page reference string pattern
-2. Number of available frames
-3. Chosen replacement algorithm
-
-A lower page fault rate indicates more efficient memory management.
-"""
-    return explanation
-def create_algorithm_animation(algo_name, pages, capacity):
-    # Simulate the chosen algorithm
-    if algo_name == "FIFO":
-        faults, steps, hit_miss, exec_time, response_times, mem_util = fifo_page_replacement(pages, capacity)
-    elif algo_name == "LRU":
-        faults, steps, hit_miss, exec_time, response_times, mem_util = lru_page_replacement(pages, capacity)
-    elif algo_name == "Optimal":
-        faults, steps, hit_miss, exec_time, response_times, mem_util = optimal_page_replacement(pages, capacity)
-    else:
-        raise ValueError("Invalid algorithm")
-    
-    # Compute cumulative page faults
-    cumulative_faults = np.cumsum([1 if hm == "Miss" else 0 for hm in hit_miss])
-    color_map = {"FIFO": "ivory", "LRU": "skyblue", "Optimal": "yellow"}
-    
-    # Create figure with enhanced styling
-    fig = go.Figure()
-    
-    # Create animation frames
-    frames = []
-    for i in range(1, len(pages) + 1):
-        # Prepare data up to current step
-        current_cumulative_faults = cumulative_faults[:i]
-        current_pages = pages[:i]
-        current_hit_miss = hit_miss[:i]
-        
-        # Create markers with different colors and annotations for hits/misses
-        scatter_colors = ['red' if hm == "Miss" else 'green' for hm in current_hit_miss]
-        marker_symbols = ['circle-x' if hm == "Miss" else 'circle' for hm in current_hit_miss]
-        
-        # Prepare hover texts and annotations
-        hover_texts = [
-            f"Page: {page}<br>Status: {status}<br>Cumulative Faults: {fault_count}"
-            for page, status, fault_count in zip(current_pages, current_hit_miss, current_cumulative_faults)
-        ]
-        
-        # Create dynamic annotations for the current point
-        annotations = []
-        if current_hit_miss and current_hit_miss[-1] == "Miss":
-            annotations.append({
-                "x": i-1,
-                "y": current_cumulative_faults[-1],
-                "text": "Page Fault!",
-                "showarrow": True,
-                "arrowhead": 1,
-                "ax": 0,
-                "ay": -40,
-                "font": {"color": "red", "size": 12}
-            })
-        elif current_hit_miss and current_hit_miss[-1] == "Hit":
-            annotations.append({
-                "x": i-1,
-                "y": current_cumulative_faults[-1],
-                "text": "Page Hit",
-                "showarrow": True,
-                "arrowhead": 1,
-                "ax": 0,
-                "ay": -40,
-                "font": {"color": "green", "size": 12}
-            })
-        
-        frame_trace = go.Scatter(
-            x=list(range(i)),
-            y=current_cumulative_faults,
-            mode='lines+markers',
-            name=algo_name,
-            line=dict(color=color_map[algo_name], width=3),
-            marker=dict(
-                size=10,
-                color=scatter_colors,
-                symbol=marker_symbols,
-                line=dict(width=2, color='white')
-            ),
-            text=hover_texts,
-            hovertemplate="%{text}<extra></extra>"
-        )
-        
-        frames.append(go.Frame(
-            data=[frame_trace],
-            name=f'frame_{i}',
-            layout={'annotations': annotations}
-        ))
-    
-    # Initial trace (same as the first frame)
-    initial_trace = go.Scatter(
-        x=list(range(len(pages))),
-        y=cumulative_faults,
-        mode='lines+markers',
-        name=algo_name,
-        line=dict(color=color_map[algo_name], width=3),
-        marker=dict(
-            size=10,
-            color=['red' if hm == "Miss" else 'green' for hm in hit_miss],
-            symbol=['circle-x' if hm == "Miss" else 'circle' for hm in hit_miss],
-            line=dict(width=2, color='white')
-        ),
-        text=[
-            f"Page: {page}<br>Status: {status}<br>Cumulative Faults: {fault_count}"
-            for page, status, fault_count in zip(pages, hit_miss, cumulative_faults)
-        ],
-        hovertemplate="%{text}<extra></extra>"
-    )
-    
-    fig.add_trace(initial_trace)
-    
-    # Enhanced layout
-    fig.update_layout(
-        title={
-            'text': f"{algo_name} Algorithm: Cumulative Page Faults",
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': dict(size=16)
-        },
-        xaxis_title="Page Requests",
-        yaxis_title="Cumulative Page Faults",
-        
-        # Responsive sizing
-        autosize=True,
-        height=450,  # Fixed height for consistency
-        
-        # Axis configurations
-        xaxis=dict(
-            range=[-1, len(pages)],
-            dtick=1,
-            showgrid=False,
-            zeroline=False
-        ),
-        yaxis=dict(
-            range=[0, max(cumulative_faults) + 1],
-            showgrid=False,
-            zeroline=False
-        ),
-        
-        # Dark theme styling
-        plot_bgcolor='rgba(0,0,0,0.1)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        
-        # Animation controls
-        updatemenus=[
-            {
-                "type": "buttons",
-                "direction": "left",
-                "showactive": False,
-                "x": 0.1,
-                "y": -0.2,
-                "buttons": [
-                    {
-                        "label": "Play",
-                        "method": "animate",
-                        "args": [None, {
-                            "frame": {"duration": 300, "redraw": True},
-                            "transition": {"duration": 100},
-                            "fromcurrent": True,
-                            "mode": "immediate"
-                        }]
-                    },
-                    {
-                        "label": "Pause",
-                        "method": "animate",
-                        "args": [[None], {
-                            "frame": {"duration": 0, "redraw": False},
-                            "mode": "immediate",
-                            "transition": {"duration": 0}
-                        }]
-                    }
-                ]
-            }
-        ]
-    )
-    
-    # Set the frames
-    fig.frames = frames
-    
-    return fig, faults, hit_miss, exec_time, response_times, mem_util
-# -------------------------
-# Streamlit UI Code
-# -------------------------
-st.title("Advanced Page Replacement Algorithm Simulator")
-
-# Input methods
-page_string = st.text_input("Enter reference string (comma-separated numbers):", "7, 0, 1, 2, 0, 3, 4, 2, 3, 0, 3, 2")
-capacity = st.slider("Number of frames:", min_value=1, max_value=10, value=3)
-algorithm = st.selectbox("Select Algorithm for Detailed Metrics:", ["FIFO", "LRU", "Optimal"])
-
-if st.button("Run Advanced Simulation", key="run_advanced_simulation_button"):
-    # Convert input string to list of integers
-    pages = list(map(int, page_string.split(',')))
-    
-    # Run simulation for the selected algorithm for detailed metrics
-    if algorithm == "FIFO":
-        faults, steps, hit_miss, exec_time, response_times, mem_util = fifo_page_replacement(pages, capacity)
-    elif algorithm == "LRU":
-        faults, steps, hit_miss, exec_time, response_times, mem_util = lru_page_replacement(pages, capacity)
-    else:
-        faults, steps, hit_miss, exec_time, response_times, mem_util = optimal_page_replacement(pages, capacity)
-    
-    hit_rate = ((len(pages) - faults) / len(pages)) * 100
-    fault_rate = (faults / len(pages)) * 100
-    avg_response_time = np.mean(response_times) * 1000  # in milliseconds
-    
-    # Display Results
-    st.subheader("Simulation Results")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Total Page Faults", faults)
-    with col2:
-        st.metric("Page Hit Rate", f"{hit_rate:.2f}%")
-    with col3:
-        st.metric("Page Miss Rate", f"{fault_rate:.2f}%")
-    
-    # -------------------------
-    # Independent Animation Plots for All Algorithms
-    # -------------------------
-    st.subheader("Algorithm Performance Animations")
-    # Create three columns for independent figures
-    col_fifo, col_lru, col_opt = st.columns(3)
-    
-    # FIFO Animation
-    with col_fifo:
-        fig_fifo, faults_fifo, hit_miss_fifo, exec_time_fifo, response_times_fifo, mem_util_fifo = create_algorithm_animation("FIFO", pages, capacity)
-        st.plotly_chart(fig_fifo, use_container_width=True)
-    
-    # LRU Animation
-    with col_lru:
-        fig_lru, faults_lru, hit_miss_lru, exec_time_lru, response_times_lru, mem_util_lru = create_algorithm_animation("LRU", pages, capacity)
-        st.plotly_chart(fig_lru, use_container_width=True)
-    
-    # Optimal Animation
-    with col_opt:
-        fig_opt, faults_opt, hit_miss_opt, exec_time_opt, response_times_opt, mem_util_opt = create_algorithm_animation("Optimal", pages, capacity)
-        st.plotly_chart(fig_opt, use_container_width=True)
-    
-    # Detailed Metrics Table for the selected algorithm
-    metrics_df = pd.DataFrame([
-        {
-            "Algorithm": algorithm, 
-            "Page Faults": faults, 
-            "Hit Rate": f"{hit_rate:.2f}%", 
-            "Fault Rate": f"{fault_rate:.2f}%", 
-            #"Memory Utilization": f"{mem_util:.2f}%", 
-            "Execution Time": f"{exec_time:.6f} s",
-            "Avg Response Time": f"{avg_response_time:.4f} ms"
-        }
-    ])
-    
-    st.dataframe(metrics_df)
-    
-    st.download_button(
-        "Download as CSV", 
-        metrics_df.to_csv(index=False), 
-        "page_replacement_results.csv", 
-        "text/csv"
-    )
-    
-    # Algorithm Concepts Explanation
-    st.markdown(generate_concepts_explanation(algorithm, pages, capacity, faults), unsafe_allow_html=True)
+import streamlit as st
+from itertools import accumulate
+from checkpoint import CheckpointedRun
+from cost_model import compare_costs, simulate_costs, POLICIES
+from downsample import ANIMATION_LIMIT, MAX_CURVE_POINTS
+from fault_rate import FaultRateMonitor
+from fault_service import compare_fault_service
+from huge_pages import compare_huge_pages, BASE_PAGE_SIZE
+from locality import analyze_locality
+from page_replacement import parse_reference_string
+from prefetch import compare_prefetchers, PREFETCHERS
+from tiered_memory import fast_tier_sweep, required_fast_tier, simulate_tiers, TIER_POLICIES
+
+# -------------------------
+# Concepts Explanation Function
+# -------------------------
+def generate_concepts_explanation(algorithm, pages, capacity, faults, cost=None, locality=None):
+    explanation = f"## Concepts Covered: {algorithm} Page Replacement Algorithm\n\n"
+    explanation += "### Algorithm Overview\n"
+    explanation += f"The simulation used a page reference string of {len(pages)} pages with a frame capacity of {capacity}.\n\n"
+    
+    if algorithm == "FIFO":
+        explanation += """
+#### First-In-First-Out (FIFO) Page Replacement
+
+FIFO is the simplest page replacement algorithm:
+- New pages are added to the end of the frame
+- When frames are full, the oldest page (first one added) is removed
+- Works like a queue: first page in is the first to be replaced
+
+**Key Characteristics:**
+- Simple to implement
+- Doesn't consider page usage frequency
+- Can suffer from Belady's anomaly (more frames can increase page faults)
+"""
+    
+    elif algorithm == "LRU":
+        explanation += """
+#### Least Recently Used (LRU) Page Replacement
+
+LRU tracks the order of page usage more intelligently:
+- Most recently used page moves to the end of the frame list
+- When frames are full, the least recently used page is removed
+- Assumes recently used pages are more likely to be used again
+
+**Key Characteristics:**
+- More adaptive than FIFO
+- Considers recent page access patterns
+- Requires tracking page usage order
+"""
+    
+    elif algorithm == "Optimal":
+        explanation += """
+#### Optimal Page Replacement
+
+Optimal algorithm makes the most theoretically efficient replacement:
+- Replaces the page that won't be used for the longest time in the future
+- Looks ahead in the page reference string to make the best replacement decision
+- Impossible to implement perfectly in real systems, but serves as a theoretical benchmark
+
+**Key Characteristics:**
+- Minimizes page faults
+- Requires future knowledge of page references
+- Used as a theoretical ideal for comparing other algorithms
+"""
+    
+    total_pages = len(pages)
+    unique_pages = len(set(pages))
+    fault_percentage = (faults / total_pages) * 100
+    hit_percentage = 100 - fault_percentage
+    
+    explanation += f"\n### Performance Insights\n"
+    explanation += f"""
+- **Total Pages Processed:** {total_pages}
+- **Unique Pages in Reference String:** {unique_pages}
+- **Frame Capacity:** {capacity}
+- **Page Fault Rate:** {fault_percentage:.2f}%
+- **Page Hit Rate:** {hit_percentage:.2f}%
+"""
+    if cost is not None:
+        explanation += f"""- **Writes in Reference String:** {cost['writes']}
+- **Dirty Page Write-backs:** {cost['write_backs']}
+- **Effective Access Time:** {cost['effective_access_time'] / 1000:.2f} µs
+"""
+    if locality is not None:
+        explanation += f"""- **Cold Misses (first references):** {locality['cold_misses']}
+- **Reuses Within {capacity} Distinct Pages:** {locality['reuses_within_capacity']} of {locality['references'] - locality['cold_misses']}
+- **Mean Working Set ({locality['window']} references):** {locality['mean_working_set']:.2f} pages
+"""
+    explanation += """
+### Interpretation
+The performance depends on:
+1. Page reference string pattern
+2. Number of available frames
+3. Chosen replacement algorithm
+4. How many evicted pages are dirty and must be written back
+
+A lower page fault rate indicates more efficient memory management.
+"""
+    return explanation
+# -------------------------
+# Checkpointed Simulation Runs
+# -------------------------
+def run_algorithm(algo_name, pages, capacity):
+    # Runs are kept per (algorithm, frames) for the whole session, so appending
+    # to the reference string or editing its tail resumes from the nearest
+    # checkpoint instead of starting again from the first reference
+    runs = st.session_state.setdefault("checkpointed_runs", {})
+    key = (algo_name, capacity)
+    if key not in runs:
+        runs[key] = CheckpointedRun(algo_name, capacity)
+    return runs[key].run(pages)
+
+def create_large_trace_figure(algo_name, cumulative_faults, color):
+    # Long traces: one WebGL trace of the downsampled fault curve, without
+    # per-point markers, annotations or animation frames, so the browser
+    # payload stays bounded however long the trace is
+    import plotly.graph_objs as go
+    from downsample import downsample_curve
+
+    x, y = downsample_curve(cumulative_faults)
+    fig = go.Figure(
+        go.Scattergl(
+            x=x,
+            y=y,
+            mode='lines',
+            name=algo_name,
+            line=dict(color=color, width=2),
+            hovertemplate=
+                "<b>%{fullData.name}</b><br>" +
+                "Page Request: %{x}<br>" +
+                "Cumulative Page Faults: %{y}<extra></extra>"
+        )
+    )
+    fig.update_layout(
+        title={
+            'text': f"{algo_name} Algorithm: Cumulative Page Faults ({len(x)} of {len(cumulative_faults)} points)",
+            'y':0.95,
+            'x':0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': dict(size=16)
+        },
+        xaxis_title="Page Requests",
+        yaxis_title="Cumulative Page Faults",
+        autosize=True,
+        height=450,
+        xaxis=dict(showgrid=False, zeroline=False),
+        yaxis=dict(showgrid=False, zeroline=False),
+        plot_bgcolor='rgba(0,0,0,0.1)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def create_algorithm_animation(algo_name, pages, capacity):
+    # Simulate the chosen algorithm
+    # Plotly is only imported once a chart is actually drawn
+    import plotly.graph_objs as go
+
+    faults, steps, hit_miss, exec_time, response_times, mem_util = run_algorithm(algo_name, pages, capacity)
+    
+    # Compute cumulative page faults
+    cumulative_faults = list(accumulate(1 if hm == "Miss" else 0 for hm in hit_miss))
+    color_map = {"FIFO": "ivory", "LRU": "skyblue", "Optimal": "yellow"}
+    
+    if len(pages) > ANIMATION_LIMIT:
+        fig = create_large_trace_figure(algo_name, cumulative_faults, color_map[algo_name])
+        return fig, faults, hit_miss, exec_time, response_times, mem_util
+    
+    # Create figure with enhanced styling
+    fig = go.Figure()
+    
+    # Create animation frames
+    frames = []
+    for i in range(1, len(pages) + 1):
+        # Prepare data up to current step
+        current_cumulative_faults = cumulative_faults[:i]
+        current_pages = pages[:i]
+        current_hit_miss = hit_miss[:i]
+        
+        # Create markers with different colors and annotations for hits/misses
+        scatter_colors = ['red' if hm == "Miss" else 'green' for hm in current_hit_miss]
+        marker_symbols = ['circle-x' if hm == "Miss" else 'circle' for hm in current_hit_miss]
+        
+        # Prepare hover texts and annotations
+        hover_texts = [
+            f"Page: {page}<br>Status: {status}<br>Cumulative Faults: {fault_count}"
+            for page, status, fault_count in zip(current_pages, current_hit_miss, current_cumulative_faults)
+        ]
+        
+        # Create dynamic annotations for the current point
+        annotations = []
+        if current_hit_miss and current_hit_miss[-1] == "Miss":
+            annotations.append({
+                "x": i-1,
+                "y": current_cumulative_faults[-1],
+                "text": "Page Fault!",
+                "showarrow": True,
+                "arrowhead": 1,
+                "ax": 0,
+                "ay": -40,
+                "font": {"color": "red", "size": 12}
+            })
+        elif current_hit_miss and current_hit_miss[-1] == "Hit":
+            annotations.append({
+                "x": i-1,
+                "y": current_cumulative_faults[-1],
+                "text": "Page Hit",
+                "showarrow": True,
+                "arrowhead": 1,
+                "ax": 0,
+                "ay": -40,
+                "font": {"color": "green", "size": 12}
+            })
+        
+        frame_trace = go.Scatter(
+            x=list(range(i)),
+            y=current_cumulative_faults,
+            mode='lines+markers',
+            name=algo_name,
+            line=dict(color=color_map[algo_name], width=3),
+            marker=dict(
+                size=10,
+                color=scatter_colors,
+                symbol=marker_symbols,
+                line=dict(width=2, color='white')
+            ),
+            text=hover_texts,
+            hovertemplate="%{text}<extra></extra>"
+        )
+        
+        frames.append(go.Frame(
+            data=[frame_trace],
+            name=f'frame_{i}',
+            layout={'annotations': annotations}
+        ))
+    
+    # Initial trace (same as the first frame)
+    initial_trace = go.Scatter(
+        x=list(range(len(pages))),
+        y=cumulative_faults,
+        mode='lines+markers',
+        name=algo_name,
+        line=dict(color=color_map[algo_name], width=3),
+        marker=dict(
+            size=10,
+            color=['red' if hm == "Miss" else 'green' for hm in hit_miss],
+            symbol=['circle-x' if hm == "Miss" else 'circle' for hm in hit_miss],
+            line=dict(width=2, color='white')
+        ),
+        text=[
+            f"Page: {page}<br>Status: {status}<br>Cumulative Faults: {fault_count}"
+            for page, status, fault_count in zip(pages, hit_miss, cumulative_faults)
+        ],
+        hovertemplate="%{text}<extra></extra>"
+    )
+    
+    fig.add_trace(initial_trace)
+    
+    # Enhanced layout
+    fig.update_layout(
+        title={
+            'text': f"{algo_name} Algorithm: Cumulative Page Faults",
+            'y':0.95,
+            'x':0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': dict(size=16)
+        },
+        xaxis_title="Page Requests",
+        yaxis_title="Cumulative Page Faults",
+        
+        # Responsive sizing
+        autosize=True,
+        height=450,  # Fixed height for consistency
+        
+        # Axis configurations
+        xaxis=dict(
+            range=[-1, len(pages)],
+            dtick=1 if len(pages) <= 30 else None,  # one tick per request only while they stay readable
+            showgrid=False,
+            zeroline=False
+        ),
+        yaxis=dict(
+            range=[0, max(cumulative_faults) + 1],
+            showgrid=False,
+            zeroline=False
+        ),
+        
+        # Dark theme styling
+        plot_bgcolor='rgba(0,0,0,0.1)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        
+        # Animation controls
+        updatemenus=[
+            {
+                "type": "buttons",
+                "direction": "left",
+                "showactive": False,
+                "x": 0.1,
+                "y": -0.2,
+                "buttons": [
+                    {
+                        "label": "Play",
+                        "method": "animate",
+                        "args": [None, {
+                            "frame": {"duration": 300, "redraw": True},
+                            "transition": {"duration": 100},
+                            "fromcurrent": True,
+                            "mode": "immediate"
+                        }]
+                    },
+                    {
+                        "label": "Pause",
+                        "method": "animate",
+                        "args": [[None], {
+                            "frame": {"duration": 0, "redraw": False},
+                            "mode": "immediate",
+                            "transition": {"duration": 0}
+                        }]
+                    }
+                ]
+            }
+        ]
+    )
+    
+    # Set the frames
+    fig.frames = frames
+    
+    return fig, faults, hit_miss, exec_time, response_times, mem_util
+# -------------------------
+# Streamlit UI Code
+# -------------------------
+st.title("Advanced Page Replacement Algorithm Simulator")
+
+# Input methods
+page_string = st.text_input("Enter reference string (comma-separated numbers, suffix 'w' marks a write, e.g. 3w):", "7, 0, 1, 2, 0, 3, 4, 2, 3, 0, 3, 2")
+capacity = st.slider("Number of frames:", min_value=1, max_value=10, value=3)
+algorithm = st.selectbox("Select Algorithm for Detailed Metrics:", ["FIFO", "LRU", "Optimal"])
+with st.expander("I/O Cost Model"):
+    memory_latency = st.number_input("Memory access latency (ns):", min_value=0, value=100)
+    disk_latency = st.number_input("Page fault service latency (ns):", min_value=0, value=8_000_000)
+    write_back_latency = st.number_input("Dirty page write-back latency (ns):", min_value=0, value=8_000_000)
+with st.expander("Fault Service Timing"):
+    io_channels = st.number_input("Concurrent I/O channels:", min_value=1, value=1)
+    issuer_threads = st.number_input("Threads issuing references (round-robin):", min_value=1, value=1)
+with st.expander("Prefetching"):
+    prefetcher = st.selectbox("Prefetcher:", ["None"] + list(PREFETCHERS))
+    prefetch_degree = st.slider("Pages fetched ahead:", min_value=1, max_value=8, value=1)
+with st.expander("Tiered Memory"):
+    slow_tier_frames = st.slider("Slow-tier frames (fast tier = number of frames):", min_value=0, max_value=20, value=0)
+    slow_tier_latency = st.number_input("Slow-tier access latency (ns):", min_value=0, value=300)
+with st.expander("Huge Pages"):
+    huge_page_frames = st.slider("Base pages per huge page (0 or 1 = off):", min_value=0, max_value=10, value=0)
+    huge_page_density = st.slider("Promote a region when this fraction of its pages is used:",
+                                  min_value=0.0, max_value=1.0, value=0.5)
+with st.expander("Fault-Rate Monitor"):
+    fault_rate_window = st.slider("Fault-rate window (references):", min_value=2, max_value=1000, value=10)
+with st.expander("Locality Analysis"):
+    working_set_window = st.slider("Working-set window (references):", min_value=1, max_value=100, value=10)
+
+if st.button("Run Advanced Simulation", key="run_advanced_simulation_button"):
+    # Convert input string to list of integers
+    pages, writes = parse_reference_string(page_string)
+    latencies = dict(memory_latency=memory_latency, disk_latency=disk_latency, write_back_latency=write_back_latency)
+    
+    # Run simulation for the selected algorithm for detailed metrics
+    faults, steps, hit_miss, exec_time, response_times, mem_util = run_algorithm(algorithm, pages, capacity)
+    simulated = st.session_state["checkpointed_runs"][(algorithm, capacity)].simulated
+    
+    hit_rate = ((len(pages) - faults) / len(pages)) * 100
+    fault_rate = (faults / len(pages)) * 100
+    avg_response_time = sum(response_times) / len(response_times) * 1000  # in milliseconds
+    
+    # Display Results
+    st.subheader("Simulation Results")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Page Faults", faults)
+    with col2:
+        st.metric("Page Hit Rate", f"{hit_rate:.2f}%")
+    with col3:
+        st.metric("Page Miss Rate", f"{fault_rate:.2f}%")
+    if simulated < len(pages):
+        st.caption(f"Resumed from checkpoint: simulated {simulated} of {len(pages)} references")
+    
+    # -------------------------
+    # Independent Animation Plots for All Algorithms
+    # -------------------------
+    st.subheader("Algorithm Performance Animations")
+    # Create three columns for independent figures
+    col_fifo, col_lru, col_opt = st.columns(3)
+    
+    # FIFO Animation
+    with col_fifo:
+        fig_fifo, faults_fifo, hit_miss_fifo, exec_time_fifo, response_times_fifo, mem_util_fifo = create_algorithm_animation("FIFO", pages, capacity)
+        st.plotly_chart(fig_fifo, use_container_width=True)
+    
+    # LRU Animation
+    with col_lru:
+        fig_lru, faults_lru, hit_miss_lru, exec_time_lru, response_times_lru, mem_util_lru = create_algorithm_animation("LRU", pages, capacity)
+        st.plotly_chart(fig_lru, use_container_width=True)
+    
+    # Optimal Animation
+    with col_opt:
+        fig_opt, faults_opt, hit_miss_opt, exec_time_opt, response_times_opt, mem_util_opt = create_algorithm_animation("Optimal", pages, capacity)
+        st.plotly_chart(fig_opt, use_container_width=True)
+    
+    # Windowed / decayed fault rate and detected phases for the selected algorithm
+    import pandas as pd
+    st.subheader("Fault Rate Over Time")
+    monitor = FaultRateMonitor(window=fault_rate_window, sample_every=max(len(pages) // MAX_CURVE_POINTS, 1)).feed(hit_miss)
+    rate_summary = monitor.summary()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(f"Peak Fault Rate ({fault_rate_window} refs)", f"{rate_summary['peak_window_fault_rate']:.2%}")
+    with col2:
+        st.metric("Phases Detected", rate_summary["phases"])
+    with col3:
+        st.metric("References in Thrashing Phases", rate_summary["thrashing_references"])
+    st.line_chart(pd.DataFrame(
+        [(window_rate, ewma) for _, window_rate, ewma in monitor.series],
+        index=[index for index, _, _ in monitor.series],
+        columns=["Window Fault Rate", "EWMA Fault Rate"]
+    ))
+    st.dataframe(pd.DataFrame(monitor.phases).rename(columns={
+        "start": "First Reference", "end": "End", "faults": "Faults", "fault_rate": "Fault Rate", "thrashing": "Thrashing"
+    }))
+    
+    # Detailed Metrics Table for the selected algorithm
+    metrics_df = pd.DataFrame([
+        {
+            "Algorithm": algorithm, 
+            "Page Faults": faults, 
+            "Hit Rate": f"{hit_rate:.2f}%", 
+            "Fault Rate": f"{fault_rate:.2f}%", 
+            #"Memory Utilization": f"{mem_util:.2f}%", 
+            "Execution Time": f"{exec_time:.6f} s",
+            "Avg Response Time": f"{avg_response_time:.4f} ms"
+        }
+    ])
+    
+    st.dataframe(metrics_df)
+    
+    st.download_button(
+        "Download as CSV", 
+        metrics_df.to_csv(index=False), 
+        "page_replacement_results.csv", 
+        "text/csv"
+    )
+    
+    # Full per-reference results (page, hit, victim, cumulative faults, frames),
+    # written from the checkpointed runs above rather than simulated again
+    import io
+    from step_export import export_recorded_steps, default_export_format
+    export_format = default_export_format()
+    col_fifo, col_lru, col_opt = st.columns(3)
+    for column, algo_name in zip((col_fifo, col_lru, col_opt), ("FIFO", "LRU", "Optimal")):
+        run = st.session_state["checkpointed_runs"][(algo_name, capacity)]
+        step_file = io.BytesIO()
+        export_recorded_steps(step_file, algo_name, pages, capacity, run.steps, run.hit_miss, export_format,
+                              include_frames=True)
+        with column:
+            st.download_button(
+                f"Download {algo_name} steps (.{export_format})",
+                step_file.getvalue(),
+                f"{algo_name.lower()}_steps.{export_format}",
+                "application/octet-stream",
+                key=f"download_steps_{algo_name}"
+            )
+    
+    # I/O Cost Comparison (dirty pages, write-backs, effective access time)
+    st.subheader("I/O Cost Comparison")
+    cost_df = pd.DataFrame([
+        {
+            "Policy": cost["policy"],
+            "Page Faults": cost["page_faults"],
+            "Write-backs": cost["write_backs"],
+            "Effective Access Time (µs)": cost["effective_access_time"] / 1000,
+        }
+        for cost in compare_costs(pages, writes, capacity, POLICIES, compact=True, **latencies)
+    ])
+    st.dataframe(cost_df)
+    
+    # Event-driven timing: overlapping faults on a limited number of I/O channels
+    st.subheader("Fault Service Timing")
+    service_df = pd.DataFrame([
+        {
+            "Policy": service["policy"],
+            "Page Faults": service["page_faults"],
+            "Delayed Hits": service["delayed_hits"],
+            "Completion Time (ms)": service["completion_time"] / 1e6,
+            "Peak Outstanding Faults": service["max_outstanding_faults"],
+            "Peak Queue Depth": service["max_queue_depth"],
+            "Mean Queue Depth": service["mean_queue_depth"],
+            "Channel Utilization": service["channel_utilization"],
+        }
+        for service in compare_fault_service(pages, capacity, channels=io_channels, threads=issuer_threads,
+                                             memory_latency=memory_latency, disk_latency=disk_latency)
+    ])
+    st.dataframe(service_df)
+    
+    # Prefetching impact on demand faults
+    if prefetcher != "None":
+        st.subheader(f"{prefetcher} Prefetching")
+        prefetch_df = pd.DataFrame([
+            {
+                "Policy": result["policy"],
+                "Demand Faults (no prefetch)": result["baseline_faults"],
+                "Demand Faults": result["page_faults"],
+                "Prefetches": result["prefetches"],
+                "Accuracy": result["accuracy"],
+                "Coverage": result["coverage"],
+                "Pollution (evictions)": result["prefetch_evictions"],
+            }
+            for result in compare_prefetchers(pages, capacity, prefetchers=[prefetcher], degree=prefetch_degree)
+        ])
+        st.dataframe(prefetch_df)
+    
+    # Mixed page sizes: same memory in bytes, dense regions promoted to huge pages
+    if huge_page_frames > 1:
+        st.subheader("Huge Pages")
+        if huge_page_frames > capacity:
+            st.warning("A huge page must fit in memory: use at least as many frames as base pages per huge page.")
+        else:
+            huge_df = pd.DataFrame([
+                {
+                    "Policy": result["policy"],
+                    "Pages": "base only" if result["density"] is None else "with huge pages",
+                    "Page Faults": result["page_faults"],
+                    "Promotions": result["promotions"],
+                    "KiB Loaded": result["bytes_loaded"] / 1024,
+                    "Memory Utilization (%)": result["memory_utilization"],
+                    "Internal Fragmentation (KiB)": result["mean_internal_fragmentation"] / 1024,
+                }
+                for result in compare_huge_pages(pages, capacity * BASE_PAGE_SIZE, density=huge_page_density,
+                                                 huge_size=huge_page_frames * BASE_PAGE_SIZE)
+            ])
+            st.dataframe(huge_df)
+    
+    # Fast tier of `capacity` frames in front of a slow tier
+    if slow_tier_frames:
+        st.subheader("Tiered Memory")
+        tier_latencies = dict(fast_latency=memory_latency, slow_latency=slow_tier_latency, disk_latency=disk_latency)
+        tier_df = pd.DataFrame([
+            {
+                "Policy": result["policy"],
+                "Fast-Tier Hits": result["fast_hits"],
+                "Slow-Tier Hits": result["slow_hits"],
+                "Page Faults": result["page_faults"],
+                "Promotions": result["promotions"],
+                "Demotions": result["demotions"],
+                "Avg Access Time (ns)": result["average_access_time"],
+            }
+            for result in (simulate_tiers(pages, capacity, slow_tier_frames, policy, **tier_latencies)
+                           for policy in TIER_POLICIES)
+        ])
+        st.dataframe(tier_df)
+        sweep = fast_tier_sweep(pages, range(1, capacity + slow_tier_frames + 1), slow_tier_frames, **tier_latencies)
+        st.line_chart(pd.DataFrame({
+            "Fast-Tier Frames": [result["fast_capacity"] for result in sweep],
+            "Avg Access Time (ns)": [result["average_access_time"] for result in sweep],
+        }).set_index("Fast-Tier Frames"))
+        st.write(f"LRU tiering reaches within 5% of its best access time with "
+                 f"{required_fast_tier(sweep)} fast-tier frames.")
+    
+    # Locality analysis (policy independent: reuse distances, working set, gaps)
+    st.subheader("Locality Analysis")
+    locality = analyze_locality(pages, capacity, working_set_window)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Cold Misses", locality["cold_misses"])
+    with col2:
+        st.metric("Median Reuse Distance", locality["median_reuse_distance"] if locality["median_reuse_distance"] is not None else "-")
+    with col3:
+        st.metric("Mean Working Set", f"{locality['mean_working_set']:.2f}")
+    with col4:
+        st.metric("Mean Reuse Gap", f"{locality['mean_gap']:.2f}" if locality["mean_gap"] is not None else "-")
+    # Both charts are bounded to MAX_CURVE_POINTS points whatever the trace length
+    from downsample import bin_histogram, downsample_curve
+    col_reuse, col_ws = st.columns(2)
+    with col_reuse:
+        st.caption("Reuse-distance histogram (distances below the frame count are LRU hits)")
+        distances, reuses = bin_histogram(locality["reuse_histogram"])
+        st.bar_chart(pd.DataFrame({"Reuses": reuses}, index=distances))
+    with col_ws:
+        st.caption(f"Working-set size over the last {working_set_window} references")
+        references, working_set = downsample_curve(locality["working_set_sizes"])
+        st.line_chart(pd.DataFrame({"Working Set": working_set}, index=references))
+    
+    # Algorithm Concepts Explanation
+    cost = simulate_costs(pages, writes, capacity, algorithm, compact=True, **latencies)
+    st.markdown(generate_concepts_explanation(algorithm, pages, capacity, faults, cost, locality), unsafe_allow_html=True)
@@ -0,0 +1,361 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from cost_model import simulate_costs, POLICIES, DEFAULT_MEMORY_LATENCY, DEFAULT_DISK_LATENCY, DEFAULT_WRITE_BACK_LATENCY
+from page_replacement import parse_reference_string
+
+# -------------------------
+# Headless Batch Simulation
+# -------------------------
+# Usage:
+#   python batch_cli.py traces/*.txt -a FIFO LRU Optimal -c 4 8 16 > results.ndjson
+#   valgrind --tool=lackey --trace-mem=yes ls 2>&1 | python batch_cli.py - -f lackey -c 1024
+#   python batch_cli.py trace.ptrace -c 1024 --sets 64 --set-indexing hash
+#   python batch_cli.py trace.ptrace -c 1024 --export-steps steps/
+#   python batch_cli.py trace.ptrace -c 8192 --huge-pages 0.5
+# Emits one JSON object per (trace, algorithm, capacity) on stdout as soon as
+# it is computed (in completion order with -j). No UI framework is imported.
+INPUT_FORMATS = ("auto", "pages", "lackey", "hex", "ptrace")
+# One simulation run; `options` holds the settings shared by all runs
+Job = namedtuple("Job", ("trace", "pages", "writes", "algorithm", "capacity", "options"))
+# Parallel runs keep at most this many jobs per worker queued
+QUEUED_JOBS_PER_WORKER = 2
+
+
+def _read_page_list(handle):
+    # Page numbers separated by commas and/or whitespace, "#" comments,
+    # optional "w" suffix for writes (same syntax as the apps)
+    text = handle.read()
+    if isinstance(text, bytes):
+        text = text.decode()
+    tokens = []
+    for line in text.splitlines():
+        tokens.extend(line.split('#', 1)[0].replace(',', ' ').split())
+    if not tokens:
+        return [], []
+    return parse_reference_string(",".join(tokens))
+
+
+def _sniff_format(source):
+    if str(source).endswith(".ptrace"):
+        return "ptrace"
+    if source == "-":
+        return "pages"
+    with open(source, "rb") as handle:
+        head = handle.read(4096)
+    from trace_ingest import detect_format
+    if detect_format(head) == "lackey":
+        return "lackey"
+    for line in head.splitlines():
+        line = line.strip().lower()
+        if not line or line.startswith(b"#") or line.startswith(b"=="):
+            continue
+        if b"0x" in line or any(char in line for char in b"abcdef"):
+            return "hex"
+        break
+    return "pages"
+
+
+def load_references(source, fmt="auto", page_size="4K"):
+    if fmt == "auto":
+        fmt = _sniff_format(source)
+    if fmt == "pages":
+        if source == "-":
+            return _read_page_list(sys.stdin)
+        with open(source) as handle:
+            return _read_page_list(handle)
+    # Address traces go through the vectorised ingestion pipeline; NumPy is
+    # only imported when one is actually read
+    from trace_ingest import load_trace, load_compact_trace
+    if fmt == "ptrace":
+        pages, writes = load_compact_trace(source)
+    else:
+        pages, writes = load_trace(source, fmt, page_size)
+    return pages.tolist(), writes.tolist()
+
+
+def _effective_access_time(result, memory_latency, disk_latency, write_back_latency):
+    references = result["references"]
+    if not references:
+        return 0.0
+    return memory_latency + (result["page_faults"] * disk_latency
+                             + result["write_backs"] * write_back_latency) / references
+
+
+def run_job(job):
+    trace, pages, writes = job.trace, job.pages, job.writes
+    algorithm, capacity, options = job.algorithm, job.capacity, job.options
+    latencies = options["latencies"]
+    monitor = None
+    if options["window"]:
+        from fault_rate import FaultRateMonitor
+        monitor = FaultRateMonitor(window=options["window"], sample_every=max(len(pages), 1))
+    start_time = time.perf_counter()
+    if options["export"]:
+        # The export run doubles as the simulation, so nothing is run twice
+        from step_export import export_steps
+        export_dir, export_format = options["export"]
+        stem = "stdin" if trace == "-" else os.path.splitext(os.path.basename(trace))[0]
+        path = os.path.join(export_dir, f"{stem}-{algorithm}-{capacity}.{export_format}")
+        result = export_steps(path, algorithm, pages, capacity, writes, export_format, hooks=monitor)
+        result["effective_access_time"] = _effective_access_time(result, **latencies)
+    elif options["sets"] > 1:
+        # Each set is simulated on its own; NumPy is only needed here
+        from set_associative import simulate_set_associative
+        result = simulate_set_associative(pages, options["sets"], capacity // options["sets"], algorithm, writes,
+                                          options["indexing"], workers=options["set_workers"], **latencies)
+        if monitor is not None:
+            for miss in result["misses"].tolist():
+                monitor.update(miss)
+            monitor.on_end()
+        result["effective_access_time"] = _effective_access_time(result, **latencies)
+    else:
+        result = simulate_costs(pages, writes, capacity, algorithm, hooks=monitor, compact=True, **latencies)
+    seconds = time.perf_counter() - start_time
+    references = result["references"]
+    faults = result["page_faults"]
+    record = {
+        "trace": trace,
+        "algorithm": algorithm,
+        "capacity": capacity,
+        "sets": options["sets"],
+        "references": references,
+        "page_faults": faults,
+        "hits": references - faults,
+        "hit_ratio": (references - faults) / references if references else 0.0,
+        "write_backs": result["write_backs"],
+        "effective_access_time": result["effective_access_time"],
+        "seconds": seconds,
+    }
+    if options["export"]:
+        record["steps_file"] = path
+    if options["service"]:
+        from fault_service import simulate_fault_service
+        channels, threads = options["service"]
+        timing = simulate_fault_service(pages, capacity, algorithm, channels, threads,
+                                        latencies["memory_latency"], latencies["disk_latency"])
+        record.update({
+            "channels": channels,
+            "threads": threads,
+            "completion_time": timing["completion_time"],
+            "delayed_hits": timing["delayed_hits"],
+            "max_outstanding_faults": timing["max_outstanding_faults"],
+            "max_queue_depth": timing["max_queue_depth"],
+            "mean_queue_depth": timing["mean_queue_depth"],
+        })
+    if monitor is not None:
+        rates = monitor.summary()
+        record.update({
+            "window": options["window"],
+            "peak_window_fault_rate": rates["peak_window_fault_rate"],
+            "phases": rates["phases"],
+            "thrashing_references": rates["thrashing_references"],
+        })
+    if options["huge"]:
+        # Same memory in bytes, with dense regions promoted to 2M pages
+        from huge_pages import simulate_huge_pages
+        density, base_size = options["huge"]
+        promoted = simulate_huge_pages(pages, capacity * base_size, algorithm, density, base_size)
+        record.update({
+            "huge_page_density": density,
+            "promoted_page_faults": promoted["page_faults"],
+            "huge_page_faults": promoted["huge_page_faults"],
+            "huge_page_promotions": promoted["promotions"],
+            "huge_page_bytes_loaded": promoted["bytes_loaded"],
+            "mean_internal_fragmentation": promoted["mean_internal_fragmentation"],
+            "huge_page_memory_utilization": promoted["memory_utilization"],
+        })
+    if options["prefetcher"]:
+        from prefetch import simulate_prefetch, make_prefetcher
+        prefetcher = make_prefetcher(options["prefetcher"], options["degree"])
+        prefetched = simulate_prefetch(pages, capacity, algorithm, prefetcher)
+        record.update({
+            "prefetcher": options["prefetcher"],
+            "prefetch_page_faults": prefetched["page_faults"],
+            "prefetches": prefetched["prefetches"],
+            "prefetch_accuracy": prefetched["accuracy"],
+            "prefetch_coverage": prefetched["coverage"],
+            "prefetch_evictions": prefetched["prefetch_evictions"],
+        })
+    return record
+
+
+# Trace last loaded by this worker process: (source, pages, writes)
+_worker_trace = None
+
+
+def _run_worker_job(trace, source, fmt, page_size, algorithm, capacity, options):
+    # Parallel jobs only carry the trace's name; each worker loads a trace
+    # once and keeps it for the following jobs on the same trace
+    global _worker_trace
+    if _worker_trace is None or _worker_trace[0] != source:
+        _worker_trace = None  # drop the previous trace before loading the next
+        _worker_trace = (source,) + tuple(load_references(source, fmt, page_size))
+    _, pages, writes = _worker_trace
+    return run_job(Job(trace, pages, writes, algorithm, capacity, options))
+
+
+def _run_parallel(args, options, out):
+    # Jobs are submitted trace by trace with a bounded queue, and records are
+    # written as they complete, so neither the traces nor the results pile up
+    # in the parent. Standard input is spooled to a file workers can read
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    import tempfile
+    spooled = None
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            pending = set()
+            for trace in args.traces:
+                source, fmt = trace, args.format
+                if trace == "-":
+                    if spooled is None:
+                        with tempfile.NamedTemporaryFile(delete=False) as handle:
+                            handle.write(sys.stdin.buffer.read())
+                        spooled = handle.name
+                    source, fmt = spooled, "pages" if fmt == "auto" else fmt
+                for algorithm in args.algorithms:
+                    for capacity in args.capacities:
+                        if len(pending) >= args.jobs * QUEUED_JOBS_PER_WORKER:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                out.write(json.dumps(future.result()) + "\n")
+                                out.flush()
+                        pending.add(pool.submit(_run_worker_job, trace, source, fmt, args.page_size,
+                                                algorithm, capacity, options))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    out.write(json.dumps(future.result()) + "\n")
+                    out.flush()
+    finally:
+        if spooled is not None:
+            os.unlink(spooled)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run page replacement simulations headlessly and stream NDJSON results.")
+    parser.add_argument("traces", nargs="*", default=["-"], help="trace files, '-' for stdin (default)")
+    parser.add_argument("-f", "--format", choices=INPUT_FORMATS, default="auto",
+                        help="pages: page numbers; lackey/hex: address logs; ptrace: compact traces")
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=POLICIES, default=["FIFO", "LRU", "Optimal"])
+    parser.add_argument("-c", "--capacities", nargs="+", type=int, default=[3])
+    parser.add_argument("--page-size", default="4K", help="page size for address traces (4K, 2M, 1G or bytes)")
+    parser.add_argument("--memory-latency", type=float, default=DEFAULT_MEMORY_LATENCY, help="ns")
+    parser.add_argument("--disk-latency", type=float, default=DEFAULT_DISK_LATENCY, help="ns")
+    parser.add_argument("--write-back-latency", type=float, default=DEFAULT_WRITE_BACK_LATENCY, help="ns")
+    parser.add_argument("--sets", type=int, default=1,
+                        help="split each capacity into this many sets (set-associative, default 1 = fully associative)")
+    parser.add_argument("--set-indexing", choices=("modulo", "hash"), default="modulo",
+                        help="page-to-set mapping for --sets")
+    parser.add_argument("--prefetch", choices=("Sequential", "Stride", "Markov"),
+                        help="also report demand faults with this prefetcher (FIFO/LRU/Optimal only)")
+    parser.add_argument("--prefetch-degree", type=int, default=1, help="pages fetched ahead (default 1)")
+    parser.add_argument("--export-steps", metavar="DIR",
+                        help="write per-reference results of every run to DIR (one file per run)")
+    parser.add_argument("--export-format", choices=("parquet", "npz"),
+                        help="per-step file format (default: parquet if pyarrow is installed, else npz)")
+    parser.add_argument("--window", type=int,
+                        help="also report the peak fault rate over this many references and detected phases")
+    parser.add_argument("--channels", type=int,
+                        help="also run the event-driven timing model with this many concurrent I/O channels")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="threads issuing references round-robin in the timing model (default 1)")
+    parser.add_argument("--huge-pages", type=float, metavar="DENSITY",
+                        help="also report faults when 2M regions with this fraction of pages referenced become "
+                             "huge pages (capacity = frames * page size)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (default 1); a single run with --sets uses them for its sets")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if any(capacity <= 0 for capacity in args.capacities):
+        print("error: capacities must be positive", file=sys.stderr)
+        return 2
+    if args.sets <= 0 or any(capacity % args.sets for capacity in args.capacities):
+        print("error: every capacity must be a multiple of --sets", file=sys.stderr)
+        return 2
+    if args.prefetch and (args.sets > 1 or any(a not in ("FIFO", "LRU", "Optimal") for a in args.algorithms)):
+        print("error: --prefetch only supports FIFO, LRU and Optimal without --sets", file=sys.stderr)
+        return 2
+    if args.window is not None and args.window <= 0:
+        print("error: --window must be positive", file=sys.stderr)
+        return 2
+    service = None
+    if args.channels is not None:
+        if args.channels <= 0 or args.threads <= 0 or args.sets > 1 or any(
+                a not in ("FIFO", "LRU", "Optimal") for a in args.algorithms):
+            print("error: --channels needs positive --channels/--threads and FIFO, LRU or Optimal without --sets",
+                  file=sys.stderr)
+            return 2
+        service = (args.channels, args.threads)
+    if args.export_steps and args.sets > 1:
+        print("error: --export-steps does not support --sets", file=sys.stderr)
+        return 2
+    huge = None
+    if args.huge_pages is not None:
+        from huge_pages import parse_size, HUGE_PAGE_SIZE
+        base_size = parse_size(args.page_size)
+        if not 0 <= args.huge_pages <= 1 or args.sets > 1 or HUGE_PAGE_SIZE % base_size or \
+                base_size == HUGE_PAGE_SIZE or any(a not in ("FIFO", "LRU", "Optimal") for a in args.algorithms):
+            print("error: --huge-pages needs a density between 0 and 1, a page size below 2M and FIFO, LRU or "
+                  "Optimal without --sets", file=sys.stderr)
+            return 2
+        if any(capacity * base_size < HUGE_PAGE_SIZE for capacity in args.capacities):
+            print("error: --huge-pages needs capacities of at least one 2M page", file=sys.stderr)
+            return 2
+        huge = (args.huge_pages, base_size)
+    export = None
+    if args.export_steps:
+        from step_export import default_export_format
+        os.makedirs(args.export_steps, exist_ok=True)
+        export = (args.export_steps, args.export_format or default_export_format())
+    # With a single run there is nothing to spread across --jobs processes,
+    # so they simulate its sets in parallel instead
+    single_run = len(args.traces) * len(args.algorithms) * len(args.capacities) == 1
+    # Settings shared by every run; run_job reads them by name
+    options = {
+        "latencies": {
+            "memory_latency": args.memory_latency,
+            "disk_latency": args.disk_latency,
+            "write_back_latency": args.write_back_latency,
+        },
+        "sets": args.sets,
+        "indexing": args.set_indexing,
+        "set_workers": args.jobs if single_run else 1,
+        "prefetcher": args.prefetch,
+        "degree": args.prefetch_degree,
+        "export": export,
+        "window": args.window,
+        "service": service,
+        "huge": huge,
+    }
+
+    out = sys.stdout
+    try:
+        if args.jobs > 1 and not single_run:
+            # Process pools cost tens of milliseconds to import, so only
+            # parallel runs pay for them
+            _run_parallel(args, options, out)
+        else:
+            for trace in args.traces:
+                pages, writes = load_references(trace, args.format, args.page_size)
+                for algorithm in args.algorithms:
+                    for capacity in args.capacities:
+                        out.write(json.dumps(run_job(Job(trace, pages, writes, algorithm, capacity, options))) + "\n")
+                        out.flush()
+    except BrokenPipeError:
+        # Downstream consumer (e.g. `head`) closed the pipe
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
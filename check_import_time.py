@@ -0,0 +1,101 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# -------------------------
+# Import-Time Budget Check
+# -------------------------
+# Usage: python check_import_time.py [--budget-ms 50] [--cli-budget-ms 100]
+# Imports every simulation-core module in a fresh interpreter with
+# `-X importtime` and fails if one of them takes longer than the budget or
+# pulls in a plotting/UI/array stack. A tiny end-to-end batch_cli run is timed
+# the same way, so lazily imported code on the default path is covered too.
+# Exit status 1 on any violation.
+CORE_MODULES = ("page_replacement", "checkpoint", "cost_model", "translation", "prefetch", "locality", "fault_rate",
+                "fault_service", "tiered_memory", "huge_pages", "downsample",
+                "batch_cli")
+HEAVY_MODULES = ("numpy", "pandas", "plotly", "matplotlib", "streamlit", "tkinter", "pyarrow")
+DEFAULT_BUDGET_MS = 50
+DEFAULT_CLI_BUDGET_MS = 100
+CLI_RUN = (["batch_cli.py", "-c", "2"], "1,2,2,3\n")
+DEFAULT_RUNS = 5
+
+
+def measure(module, runs=DEFAULT_RUNS):
+    # Best of several runs, in milliseconds, plus any heavy modules it loaded
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    heavy = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                capture_output=True, text=True, cwd=here)
+        if result.returncode:
+            raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+        heavy = [name for name in result.stdout.strip().split(",") if name]
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                cumulative = int(fields[1]) / 1000
+                best = cumulative if best is None else min(best, cumulative)
+    return best, heavy
+
+
+def measure_cli(runs=DEFAULT_RUNS):
+    # Best wall time of a small CLI run, in milliseconds, plus any heavy
+    # modules it loaded
+    arguments, stdin = CLI_RUN
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    heavy = set()
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime"] + arguments, input=stdin,
+                                capture_output=True, text=True, cwd=here)
+        milliseconds = (time.perf_counter() - start_time) * 1000
+        if result.returncode:
+            raise RuntimeError(f"batch_cli run failed:\n{result.stderr}")
+        best = milliseconds if best is None else min(best, milliseconds)
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() in HEAVY_MODULES:
+                heavy.add(fields[2].strip())
+    return best, sorted(heavy)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the simulation core imports quickly.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--cli-budget-ms", type=float, default=DEFAULT_CLI_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in CORE_MODULES:
+        milliseconds, heavy = measure(module, args.runs)
+        status = "ok"
+        if milliseconds > args.budget_ms:
+            status = f"over budget ({args.budget_ms:g} ms)"
+            failed = True
+        if heavy:
+            status = f"imports {', '.join(heavy)}"
+            failed = True
+        print(f"{module:<20} {milliseconds:8.1f} ms  {status}")
+
+    milliseconds, heavy = measure_cli(args.runs)
+    status = "ok"
+    if milliseconds > args.cli_budget_ms:
+        status = f"over budget ({args.cli_budget_ms:g} ms)"
+        failed = True
+    if heavy:
+        status = f"imports {', '.join(heavy)}"
+        failed = True
+    print(f"{'batch_cli run':<20} {milliseconds:8.1f} ms  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import json
+import os
+import time
+from page_replacement import fifo_page_replacement, lru_page_replacement, optimal_page_replacement
+
+# -------------------------
+# Checkpointed Simulation Runs
+# -------------------------
+# A CheckpointedRun remembers the last reference string it simulated plus a
+# snapshot of the engine state (frame contents in queue/recency order and the
+# fault count) every `interval` references. Running it again on a string that
+# shares a prefix with the previous one resumes from the nearest checkpoint
+# inside that prefix instead of starting from reference 0.
+# Optimal looks ahead at the whole string, so any change to the string can
+# change earlier decisions; it is only reused when the string is unchanged.
+# The end of every run is checkpointed as well, so appending references only
+# simulates the appended part.
+ENGINES = {
+    "FIFO": fifo_page_replacement,
+    "LRU": lru_page_replacement,
+    "Optimal": optimal_page_replacement,
+}
+RESUMABLE = ("FIFO", "LRU")
+DEFAULT_INTERVAL = 256
+
+
+class CheckpointedRun:
+    def __init__(self, algorithm, capacity, interval=DEFAULT_INTERVAL):
+        if algorithm not in ENGINES:
+            raise ValueError("Invalid algorithm")
+        if capacity <= 0 or interval <= 0:
+            raise ValueError("Capacity and checkpoint interval must be positive")
+        self.algorithm = algorithm
+        self.capacity = capacity
+        self.interval = interval
+        self.pages = []
+        self.steps = []
+        self.hit_miss = []
+        self.response_times = []
+        self.checkpoints = [{"position": 0, "frame": [], "page_faults": 0}]
+        # Number of references actually simulated by the latest run
+        self.simulated = 0
+
+    def _restart_checkpoint(self, pages):
+        if self.algorithm not in RESUMABLE:
+            if pages == self.pages:
+                return self.checkpoints[-1]
+            return self.checkpoints[0]
+        common = len(os.path.commonprefix([self.pages, pages]))
+        for checkpoint in reversed(self.checkpoints):
+            if checkpoint["position"] <= common:
+                return checkpoint
+        return self.checkpoints[0]
+
+    def run(self, pages):
+        # Same return value as the page_replacement engines; the returned
+        # lists are owned by this run and are reused by later calls
+        # Runs of a repeated page are simulated once (see compaction.py)
+        from compaction import run_compacted
+        start_time = time.time()
+        pages = list(pages)
+        checkpoint = self._restart_checkpoint(pages)
+        position = checkpoint["position"]
+        page_faults = checkpoint["page_faults"]
+
+        del self.steps[position:]
+        del self.hit_miss[position:]
+        del self.response_times[position:]
+        self.checkpoints = [c for c in self.checkpoints if c["position"] <= position]
+        self.simulated = len(pages) - position
+
+        if self.algorithm not in RESUMABLE:
+            if position < len(pages):
+                page_faults, steps, hit_miss, _, response_times, _ = run_compacted(
+                    ENGINES[self.algorithm], pages, self.capacity)
+                self.steps[:] = steps
+                self.hit_miss[:] = hit_miss
+                self.response_times[:] = response_times
+                self.checkpoints = [self.checkpoints[0],
+                                    {"position": len(pages), "frame": list(steps[-1]) if steps else [],
+                                     "page_faults": page_faults}]
+        else:
+            engine = ENGINES[self.algorithm]
+            frame = checkpoint["frame"]
+            while position < len(pages):
+                # Simulate up to the next interval boundary, then snapshot
+                end = min(position + self.interval - position % self.interval, len(pages))
+                faults, steps, hit_miss, _, response_times, _ = run_compacted(
+                    engine, pages[position:end], self.capacity, frame)
+                self.steps.extend(steps)
+                self.hit_miss.extend(hit_miss)
+                self.response_times.extend(response_times)
+                page_faults += faults
+                frame = steps[-1]
+                position = end
+                if position % self.interval == 0 or position == len(pages):
+                    self.checkpoints.append({"position": position, "frame": list(frame), "page_faults": page_faults})
+
+        self.pages = pages
+        execution_time = time.time() - start_time
+        memory_utilization = (len(set(pages)) / self.capacity) * 100
+        return page_faults, self.steps, self.hit_miss, execution_time, self.response_times, memory_utilization
+
+    # -------------------------
+    # Serialisation
+    # -------------------------
+    def to_dict(self):
+        return {
+            "algorithm": self.algorithm,
+            "capacity": self.capacity,
+            "interval": self.interval,
+            "pages": self.pages,
+            "steps": self.steps,
+            "hit_miss": self.hit_miss,
+            "response_times": self.response_times,
+            "checkpoints": self.checkpoints,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        run = cls(state["algorithm"], state["capacity"], state["interval"])
+        run.pages = list(state["pages"])
+        run.steps = [list(step) for step in state["steps"]]
+        run.hit_miss = list(state["hit_miss"])
+        run.response_times = list(state["response_times"])
+        run.checkpoints = [dict(checkpoint) for checkpoint in state["checkpoints"]]
+        return run
+
+    def save(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
@@ -0,0 +1,98 @@
+import time
+from itertools import accumulate
+
+# -------------------------
+# Run-Length Trace Compaction
+# -------------------------
+# A reference to the page referenced just before it is a hit for any capacity
+# and leaves FIFO, LRU and Optimal state unchanged: FIFO never reorders on a
+# hit, the page is already most recent for LRU, and for Optimal only the page's
+# next use moves, which keeps its order relative to every other page. So each
+# run of equal consecutive references can be simulated once and expanded back
+# afterwards with exactly the same per-reference results. A run is dirty if
+# any reference in it is a write.
+# Other hits (e.g. re-referencing one of the last few pages) do change LRU
+# recency or Optimal look-ahead, so only runs are collapsed.
+# Runs are found in pure Python; NumPy is only imported for array inputs and
+# traces of at least NUMPY_MIN_REFERENCES, where one vectorised comparison
+# pays for the import.
+NUMPY_MIN_REFERENCES = 1 << 18
+
+
+def _compact_numpy(pages, writes):
+    import numpy as np
+    pages = np.asarray(pages)
+    change = np.empty(len(pages), dtype=bool)
+    change[0] = True
+    np.not_equal(pages[1:], pages[:-1], out=change[1:])
+    starts = np.flatnonzero(change)
+    lengths = np.diff(np.append(starts, len(pages)))
+    run_writes = None
+    if writes is not None:
+        run_writes = np.logical_or.reduceat(np.asarray(writes, dtype=bool), starts).tolist()
+    return pages[starts].tolist(), lengths.tolist(), run_writes
+
+
+def _compact_lists(pages, writes):
+    run_pages = []
+    lengths = []
+    run_writes = None if writes is None else []
+    previous = object()
+    for i, page in enumerate(pages):
+        if page == previous:
+            lengths[-1] += 1
+            if writes is not None and writes[i]:
+                run_writes[-1] = True
+            continue
+        previous = page
+        run_pages.append(page)
+        lengths.append(1)
+        if writes is not None:
+            run_writes.append(bool(writes[i]))
+    return run_pages, lengths, run_writes
+
+
+def compact_trace(pages, writes=None):
+    # Returns lists (run_pages, run_lengths, run_writes); run_writes is None
+    # without writes
+    if not len(pages):
+        return [], [], None if writes is None else []
+    if hasattr(pages, "dtype") or len(pages) >= NUMPY_MIN_REFERENCES:
+        return _compact_numpy(pages, writes)
+    return _compact_lists(pages, writes)
+
+
+def run_starts(lengths):
+    return [0] + list(accumulate(lengths))[:-1]
+
+
+def expand_outcomes(hit_miss, lengths):
+    # "Hit"/"Miss" per run -> per reference; repeats are hits
+    outcomes = ["Hit"] * sum(lengths)
+    for start, outcome in zip(run_starts(lengths), hit_miss):
+        if outcome == "Miss":
+            outcomes[start] = "Miss"
+    return outcomes
+
+
+def expand_rows(rows, lengths):
+    # Per-run rows (e.g. frame states) -> per reference. Repeats share the
+    # run's row object, since the state does not change within a run
+    return [row for row, length in zip(rows, lengths) for _ in range(length)]
+
+
+def run_compacted(engine, pages, capacity, *args):
+    # Runs one of the page_replacement engines on the compacted trace and
+    # returns the same 6-tuple as running it on `pages`. Collapsed references
+    # are not simulated, so their response time is 0
+    run_pages, lengths, _ = compact_trace(pages)
+    if len(run_pages) == len(pages):
+        return engine(pages, capacity, *args)
+    start_time = time.time()
+    page_faults, steps, hit_miss, _, response_times, _ = engine(run_pages, capacity, *args)
+    run_times = [[response_time] + [0.0] * (length - 1)
+                 for response_time, length in zip(response_times, lengths)]
+    execution_time = time.time() - start_time
+    memory_utilization = (len(set(run_pages)) / capacity) * 100
+    return (page_faults, expand_rows(steps, lengths), expand_outcomes(hit_miss, lengths), execution_time,
+            [response_time for times in run_times for response_time in times], memory_utilization)
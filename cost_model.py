@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from itertools import islice
+from engine_hooks import farthest_use_slot, next_use_table, run_instrumented
+
+# -------------------------
+# Read/Write-Aware Cost Model
+# -------------------------
+# Every reference is a read or a write. A write marks the resident page dirty
+# and evicting a dirty page costs a write-back to disk on top of the fault.
+# Effective access time (EAT, ns per reference):
+#   EAT = memory_latency + (faults * disk_latency + write_backs * write_back_latency) / references
+# Dirty-aware variants ("clean-first", CFLRU-style) look at the `clean_window`
+# pages closest to eviction and evict the first clean one among them, falling
+# back to the normal victim when they are all dirty.
+POLICIES = ("FIFO", "LRU", "Optimal", "FIFO-Clean", "LRU-Clean")
+DEFAULT_MEMORY_LATENCY = 100
+DEFAULT_DISK_LATENCY = 8_000_000
+DEFAULT_WRITE_BACK_LATENCY = 8_000_000
+
+
+def _queue_policy(pages, writes, capacity, recency, clean_window):
+    # FIFO and LRU share an insertion-ordered map page -> dirty bit; LRU moves
+    # a page to the back on every hit, FIFO only on load
+    resident = OrderedDict()
+    faults = 0
+    write_backs = 0
+    hit_miss = []
+    for page, write in zip(pages, writes):
+        if page in resident:
+            if recency:
+                resident.move_to_end(page)
+            if write:
+                resident[page] = True
+            hit_miss.append("Hit")
+            continue
+        if len(resident) >= capacity:
+            victim = None
+            if clean_window:
+                for candidate in islice(resident, clean_window):
+                    if not resident[candidate]:
+                        victim = candidate
+                        break
+            if victim is None:
+                victim, dirty = resident.popitem(last=False)
+            else:
+                dirty = resident.pop(victim)
+            write_backs += dirty
+        resident[page] = bool(write)
+        faults += 1
+        hit_miss.append("Miss")
+    dirty_at_end = sum(resident.values())
+    return faults, write_backs, dirty_at_end, hit_miss
+
+
+def _optimal_policy(pages, writes, capacity):
+    # Same victim choice as optimal_page_replacement: the first frame slot whose
+    # page is never used again, otherwise the one used farthest in the future
+    never = len(pages)
+    next_use = next_use_table(pages)
+
+    frame = []
+    dirty = {}
+    following = {}
+    faults = 0
+    write_backs = 0
+    hit_miss = []
+    for i, (page, write) in enumerate(zip(pages, writes)):
+        following[page] = next_use[i]
+        if page in dirty:
+            if write:
+                dirty[page] = True
+            hit_miss.append("Hit")
+            continue
+        if len(frame) < capacity:
+            frame.append(page)
+        else:
+            slot = farthest_use_slot(frame, following, never)
+            victim = frame[slot]
+            write_backs += dirty.pop(victim)
+            del following[victim]
+            frame[slot] = page
+        dirty[page] = bool(write)
+        faults += 1
+        hit_miss.append("Miss")
+    dirty_at_end = sum(dirty.values())
+    return faults, write_backs, dirty_at_end, hit_miss
+
+
+def simulate_costs(pages, writes=None, capacity=3, policy="LRU",
+                   memory_latency=DEFAULT_MEMORY_LATENCY, disk_latency=DEFAULT_DISK_LATENCY,
+                   write_back_latency=DEFAULT_WRITE_BACK_LATENCY, clean_window=None, hooks=None, compact=False):
+    # compact=True simulates runs of a repeated page once (see compaction.py);
+    # results are identical. Hooks always see every reference, so runs with
+    # hooks are never compacted
+    if policy not in POLICIES:
+        raise ValueError(f"Invalid policy '{policy}', expected one of {', '.join(POLICIES)}")
+    if capacity <= 0:
+        raise ValueError("Capacity must be positive")
+    pages = list(pages)
+    writes = [False] * len(pages) if writes is None else list(writes)
+    if len(writes) != len(pages):
+        raise ValueError("Need one read/write flag per page reference")
+
+    window = 0
+    if policy.endswith("-Clean"):
+        window = clean_window if clean_window is not None else max(capacity // 2, 1)
+    references = len(pages)
+    write_count = sum(1 for write in writes if write)
+    compact = compact and hooks is None
+    if compact:
+        from compaction import compact_trace, expand_outcomes
+        run_pages, lengths, run_writes = compact_trace(pages, writes)
+        if len(run_pages) < references:
+            pages, writes = run_pages, run_writes
+        else:
+            compact = False
+    if hooks is not None:
+        result = run_instrumented(policy, pages, capacity, hooks, writes, clean_window=window, record_steps=False)
+        faults, write_backs = result["page_faults"], result["write_backs"]
+        dirty_at_end, hit_miss = result["dirty_at_end"], result["hit_miss"]
+    elif policy == "Optimal":
+        faults, write_backs, dirty_at_end, hit_miss = _optimal_policy(pages, writes, capacity)
+    else:
+        faults, write_backs, dirty_at_end, hit_miss = _queue_policy(
+            pages, writes, capacity, policy.startswith("LRU"), window)
+    if compact:
+        hit_miss = expand_outcomes(hit_miss, lengths)
+
+    effective_access_time = 0.0
+    if references:
+        effective_access_time = memory_latency + (faults * disk_latency + write_backs * write_back_latency) / references
+    return {
+        "policy": policy,
+        "references": references,
+        "writes": write_count,
+        "page_faults": faults,
+        "write_backs": write_backs,
+        "dirty_at_end": dirty_at_end,
+        "effective_access_time": effective_access_time,
+        "hit_miss": hit_miss,
+    }
+
+
+def compare_costs(pages, writes=None, capacity=3, policies=POLICIES, **latencies):
+    # One cost summary per policy, without the per-reference hit/miss list
+    results = []
+    for policy in policies:
+        result = simulate_costs(pages, writes, capacity, policy, **latencies)
+        del result["hit_miss"]
+        results.append(result)
+    return results
@@ -0,0 +1,118 @@
+# -------------------------
+# Downsampling for Large Traces
+# -------------------------
+# Charts of long traces are drawn from a bounded number of points:
+#   lttb:    Largest-Triangle-Three-Buckets, keeps the visual shape of a curve
+#            with `threshold` points (first and last point always kept)
+#   min-max: the lowest and highest point of every bucket, so no spike is lost
+# Memory-state heatmaps are binned to at most `max_columns` columns (the most
+# frequent page per frame slot and bin) and histograms with many distinct
+# values are binned to at most `max_bins` bars.
+# NumPy is imported inside the functions, so the apps can read the limits
+# below at import time without loading it.
+MAX_CURVE_POINTS = 2000
+MAX_HEATMAP_COLUMNS = 1000
+ANIMATION_LIMIT = 100
+
+
+def lttb_indices(y, threshold=MAX_CURVE_POINTS):
+    # Indices of the points kept by LTTB, x is taken to be the index
+    import numpy as np
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64)
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+        # Twice the triangle area (anchor, candidate, next bucket average)
+        area = np.abs((x[anchor] - average_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (average_y - y[anchor]))
+        anchor = start + int(area.argmax())
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def minmax_indices(y, buckets=MAX_CURVE_POINTS // 2):
+    # Indices of the minimum and maximum of each of `buckets` equal buckets
+    import numpy as np
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+    size = -(-n // buckets)
+    padded = np.pad(y, (0, buckets * size - n), mode="edge").reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    indices = np.concatenate([offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def downsample_curve(y, max_points=MAX_CURVE_POINTS, method="lttb"):
+    # Returns (x, y) arrays with at most max_points points
+    import numpy as np
+    y = np.asarray(y)
+    if method == "lttb":
+        indices = lttb_indices(y, max_points)
+    elif method == "minmax":
+        indices = minmax_indices(y, max_points // 2)
+    else:
+        raise ValueError(f"Unknown downsampling method '{method}', expected 'lttb' or 'minmax'")
+    return indices, y[indices]
+
+
+def bin_histogram(histogram, max_bins=MAX_CURVE_POINTS):
+    # {value: count} -> (values, counts) sorted by value. With more than
+    # max_bins distinct integer values, counts are summed into max_bins
+    # equal-width bins labelled by their lowest value
+    values = sorted(histogram)
+    if len(values) <= max_bins:
+        return values, [histogram[value] for value in values]
+    low = values[0]
+    width = -(-(values[-1] - low + 1) // max_bins)
+    binned = {}
+    for value in values:
+        edge = low + (value - low) // width * width
+        binned[edge] = binned.get(edge, 0) + histogram[value]
+    edges = sorted(binned)
+    return edges, [binned[edge] for edge in edges]
+
+
+def binned_states(frames, slots, max_columns=MAX_HEATMAP_COLUMNS):
+    # Frame contents per reference (lists of pages, shorter while filling) ->
+    # (slots x columns) matrix for a memory-state heatmap, empty slots as 0.
+    # Long traces are split into max_columns equal-width bins of references,
+    # and each cell holds the page seen most often in that slot over the bin
+    # (the smallest page on ties)
+    import numpy as np
+    count = len(frames)
+    columns = min(count, max_columns)
+    edges = np.linspace(0, count, columns + 1).astype(np.int64)
+    states = np.zeros((slots, columns), dtype=np.int64)
+    for column in range(columns):
+        start, end = edges[column], edges[column + 1]
+        padding = [0] * slots
+        block = np.array([(list(frame) + padding)[:slots] for frame in frames[start:end]], dtype=np.int64)
+        if len(block) == 1:
+            states[:, column] = block[0]
+            continue
+        # Mode per slot: sort each slot's pages and take the longest run
+        block.sort(axis=0)
+        rows = np.arange(len(block))[:, None]
+        change = np.ones(block.shape, dtype=bool)
+        change[1:] = block[1:] != block[:-1]
+        run_start = np.maximum.accumulate(np.where(change, rows, 0), axis=0)
+        longest = np.argmax(rows - run_start, axis=0)
+        states[:, column] = block[longest, np.arange(slots)]
+    return states
@@ -0,0 +1,242 @@
+import time
+from collections import OrderedDict
+from itertools import islice
+
+# -------------------------
+# Engine Event Hooks
+# -------------------------
+# Engines accept an optional `hooks` object. Without one they run their plain
+# loop untouched; with one they hand over to run_instrumented below, which
+# replays the same policy and reports every decision:
+#   on_hit(index, page)
+#   on_miss(index, page)
+#   on_evict(index, victim, residency)  residency = references the victim stayed
+#                                       resident (counted from the start of the run
+#                                       for pages in an initial frame)
+#   on_end()                            after the last reference
+# Subclass EngineHooks and override what you need, or use BatchedHooks to
+# receive events in batches.
+INSTRUMENTED_POLICIES = ("FIFO", "LRU", "Optimal", "FIFO-Clean", "LRU-Clean")
+
+
+class EngineHooks:
+    def on_hit(self, index, page):
+        pass
+
+    def on_miss(self, index, page):
+        pass
+
+    def on_evict(self, index, victim, residency):
+        pass
+
+    def on_end(self):
+        pass
+
+
+class BatchedHooks(EngineHooks):
+    # Collects ("hit" | "miss" | "evict", index, page, residency) tuples and
+    # passes them to callback(events) every batch_size events and at the end
+    def __init__(self, callback, batch_size=4096):
+        self.callback = callback
+        self.batch_size = batch_size
+        self.events = []
+
+    def _push(self, event):
+        self.events.append(event)
+        if len(self.events) >= self.batch_size:
+            self.flush()
+
+    def on_hit(self, index, page):
+        self._push(("hit", index, page, None))
+
+    def on_miss(self, index, page):
+        self._push(("miss", index, page, None))
+
+    def on_evict(self, index, victim, residency):
+        self._push(("evict", index, victim, residency))
+
+    def on_end(self):
+        self.flush()
+
+    def flush(self):
+        if self.events:
+            self.callback(self.events)
+            self.events = []
+
+
+class ChainedHooks(EngineHooks):
+    # Fans every event out to several hook objects
+    def __init__(self, *hooks):
+        self.hooks = [hook for hook in hooks if hook is not None]
+
+    def on_hit(self, index, page):
+        for hook in self.hooks:
+            hook.on_hit(index, page)
+
+    def on_miss(self, index, page):
+        for hook in self.hooks:
+            hook.on_miss(index, page)
+
+    def on_evict(self, index, victim, residency):
+        for hook in self.hooks:
+            hook.on_evict(index, victim, residency)
+
+    def on_end(self):
+        for hook in self.hooks:
+            hook.on_end()
+
+
+# -------------------------
+# Ready-Made Profilers
+# -------------------------
+class EvictionAgeHistogram(EngineHooks):
+    # Residency of evicted pages in power-of-two buckets: bucket b counts
+    # victims that stayed resident for [2**b, 2**(b+1)) references
+    def __init__(self):
+        self.buckets = {}
+
+    def on_evict(self, index, victim, residency):
+        bucket = max(residency, 1).bit_length() - 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+
+class PageHeat(EngineHooks):
+    # Per-page hit, miss and eviction counts
+    def __init__(self):
+        self.hits = {}
+        self.misses = {}
+        self.evictions = {}
+
+    def on_hit(self, index, page):
+        self.hits[page] = self.hits.get(page, 0) + 1
+
+    def on_miss(self, index, page):
+        self.misses[page] = self.misses.get(page, 0) + 1
+
+    def on_evict(self, index, victim, residency):
+        self.evictions[victim] = self.evictions.get(victim, 0) + 1
+
+    def hottest(self, count=10):
+        pages = set(self.hits) | set(self.misses)
+        return sorted(pages, key=lambda page: self.hits.get(page, 0) + self.misses.get(page, 0), reverse=True)[:count]
+
+
+# -------------------------
+# Optimal (Belady) Helpers
+# -------------------------
+def next_use_table(pages):
+    # next_use[i] = index of the next reference to pages[i], len(pages) if none
+    never = len(pages)
+    next_use = [never] * len(pages)
+    upcoming = {}
+    for i in range(len(pages) - 1, -1, -1):
+        next_use[i] = upcoming.get(pages[i], never)
+        upcoming[pages[i]] = i
+    return next_use
+
+
+def farthest_use_slot(frame, following, never, skip=None):
+    # Frame slot of Belady's victim: the first page never used again,
+    # otherwise the one used farthest in the future (`following` maps pages to
+    # their next use). Pages with skip(page) true are passed over; None when
+    # no page is a candidate
+    slot = None
+    farthest = -1
+    for index, candidate in enumerate(frame):
+        if skip is not None and skip(candidate):
+            continue
+        if following[candidate] == never:
+            return index
+        if following[candidate] > farthest:
+            farthest = following[candidate]
+            slot = index
+    return slot
+
+
+# -------------------------
+# Instrumented Engine
+# -------------------------
+def run_instrumented(policy, pages, capacity, hooks, writes=None, initial_frame=None, clean_window=0,
+                     record_steps=True):
+    # Same decisions as the plain engines in page_replacement.py and
+    # cost_model.py; frame order in `steps` matches theirs as well
+    if policy not in INSTRUMENTED_POLICIES:
+        raise ValueError("Invalid algorithm")
+    recency = policy.startswith("LRU")
+    optimal = policy == "Optimal"
+    if not policy.endswith("-Clean"):
+        clean_window = 0
+
+    never = len(pages)
+    if optimal:
+        next_use = next_use_table(pages)
+        # First use of each page, for the pages of an initial frame
+        first_use = {}
+        if initial_frame:
+            for i, page in enumerate(pages):
+                first_use.setdefault(page, i)
+
+    start_time = time.time()
+    resident = OrderedDict((page, False) for page in initial_frame or [])
+    frame = list(resident)
+    loaded = dict.fromkeys(resident, 0)
+    following = {page: first_use.get(page, never) for page in resident} if optimal else None
+    page_faults = 0
+    write_backs = 0
+    steps = []
+    hit_miss = []
+    response_times = []
+
+    for i, page in enumerate(pages):
+        req_time = time.time()
+        write = bool(writes[i]) if writes is not None else False
+        if optimal:
+            following[page] = next_use[i]
+
+        if page in resident:
+            if recency:
+                resident.move_to_end(page)
+            if write:
+                resident[page] = True
+            hit_miss.append("Hit")
+            hooks.on_hit(i, page)
+        else:
+            page_faults += 1
+            hit_miss.append("Miss")
+            hooks.on_miss(i, page)
+            if len(resident) >= capacity:
+                if optimal:
+                    slot = farthest_use_slot(frame, following, never)
+                    victim = frame[slot]
+                    frame[slot] = page
+                    del following[victim]
+                else:
+                    victim = None
+                    if clean_window:
+                        for candidate in islice(resident, clean_window):
+                            if not resident[candidate]:
+                                victim = candidate
+                                break
+                    if victim is None:
+                        victim = next(iter(resident))
+                write_backs += resident.pop(victim)
+                hooks.on_evict(i, victim, i - loaded.pop(victim))
+            elif optimal:
+                frame.append(page)
+            resident[page] = write
+            loaded[page] = i
+
+        if record_steps:
+            steps.append(list(frame) if optimal else list(resident))
+        response_times.append(time.time() - req_time)
+
+    hooks.on_end()
+    return {
+        "page_faults": page_faults,
+        "steps": steps,
+        "hit_miss": hit_miss,
+        "execution_time": time.time() - start_time,
+        "response_times": response_times,
+        "write_backs": write_backs,
+        "dirty_at_end": sum(resident.values()),
+    }
@@ -0,0 +1,113 @@
+from engine_hooks import EngineHooks
+
+# -------------------------
+# Streaming Fault-Rate Metrics
+# -------------------------
+# FaultRateMonitor consumes the hit/miss stream of any engine (as a hook, or
+# from a finished hit_miss list) and keeps, in O(1) per reference:
+#   window rate: faults among the last `window` references (ring buffer + running sum)
+#   EWMA rate:   exponentially decayed fault rate, alpha = 2 / (span + 1)
+#   phases:      two-sided Page-Hinkley test on the fault indicator; a phase
+#                ends when the cumulative deviation from the current phase's
+#                mean fault rate exceeds `threshold` (drift allowance `delta`)
+# Phases whose fault rate is at least `thrashing_rate` are flagged as thrashing.
+DEFAULT_WINDOW = 100
+DEFAULT_DELTA = 0.05
+DEFAULT_THRESHOLD = 30.0
+DEFAULT_THRASHING_RATE = 0.5
+
+
+class FaultRateMonitor(EngineHooks):
+    def __init__(self, window=DEFAULT_WINDOW, span=None, delta=DEFAULT_DELTA, threshold=DEFAULT_THRESHOLD,
+                 thrashing_rate=DEFAULT_THRASHING_RATE, sample_every=1):
+        if window <= 0 or sample_every <= 0:
+            raise ValueError("Window and sample interval must be positive")
+        self.window = window
+        self.alpha = 2 / ((span or window) + 1)
+        self.delta = delta
+        self.threshold = threshold
+        self.thrashing_rate = thrashing_rate
+        self.sample_every = sample_every
+        self.ring = bytearray(window)
+        self.window_faults = 0
+        self.references = 0
+        self.faults = 0
+        self.ewma = 0.0
+        self.peak_window_rate = 0.0
+        # Current phase and its Page-Hinkley statistics
+        self.phase_start = 0
+        self.phase_faults = 0
+        self.rise = self.rise_min = 0.0
+        self.fall = self.fall_max = 0.0
+        self.phases = []
+        # Sampled series: (reference index, window rate, EWMA rate)
+        self.series = []
+
+    @property
+    def window_rate(self):
+        return self.window_faults / min(self.references, self.window) if self.references else 0.0
+
+    def update(self, fault):
+        slot = self.references % self.window
+        self.window_faults += fault - self.ring[slot]
+        self.ring[slot] = fault
+        self.references += 1
+        self.faults += fault
+        self.ewma += self.alpha * (fault - self.ewma)
+        if self.references >= self.window:
+            self.peak_window_rate = max(self.peak_window_rate, self.window_faults / self.window)
+        if self.references % self.sample_every == 0:
+            self.series.append((self.references - 1, self.window_rate, self.ewma))
+
+        self.phase_faults += fault
+        mean = self.phase_faults / (self.references - self.phase_start)
+        self.rise += fault - mean - self.delta
+        self.rise_min = min(self.rise_min, self.rise)
+        self.fall += fault - mean + self.delta
+        self.fall_max = max(self.fall_max, self.fall)
+        if self.rise - self.rise_min > self.threshold or self.fall_max - self.fall > self.threshold:
+            self._close_phase()
+
+    def _close_phase(self):
+        end = self.references
+        if end > self.phase_start:
+            rate = self.phase_faults / (end - self.phase_start)
+            self.phases.append({
+                "start": self.phase_start,
+                "end": end,
+                "faults": self.phase_faults,
+                "fault_rate": rate,
+                "thrashing": rate >= self.thrashing_rate,
+            })
+        self.phase_start = end
+        self.phase_faults = 0
+        self.rise = self.rise_min = 0.0
+        self.fall = self.fall_max = 0.0
+
+    def on_hit(self, index, page):
+        self.update(0)
+
+    def on_miss(self, index, page):
+        self.update(1)
+
+    def on_end(self):
+        self._close_phase()
+
+    def feed(self, hit_miss):
+        # For results that are already computed ("Hit"/"Miss" list)
+        for outcome in hit_miss:
+            self.update(outcome == "Miss")
+        self.on_end()
+        return self
+
+    def summary(self):
+        return {
+            "references": self.references,
+            "faults": self.faults,
+            "window": self.window,
+            # Runs shorter than one window only have their overall rate
+            "peak_window_fault_rate": self.peak_window_rate if self.references >= self.window else self.window_rate,
+            "final_ewma_fault_rate": self.ewma,
+            "phases": len(self.phases),
+            "thrashing_references": sum(phase["end"] - phase["start"] for phase in self.phases if phase["thrashing"]),
+        }
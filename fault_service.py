@@ -0,0 +1,172 @@
+import heapq
+from collections import OrderedDict, deque
+from cost_model import DEFAULT_MEMORY_LATENCY, DEFAULT_DISK_LATENCY
+from engine_hooks import farthest_use_slot, next_use_table
+
+# -------------------------
+# Discrete-Event Fault Service
+# -------------------------
+# Timing mode where faults take time and can overlap. The reference string is
+# dealt round-robin to `threads` issuers sharing one frame set; each issuer
+# waits for its own reference to complete before issuing the next one.
+#   hit:         completes after memory_latency
+#   fault:       a frame is taken (victim chosen by the policy among pages that
+#                are not being loaded), the read is queued for one of `channels`
+#                I/O channels and completes disk_latency after it starts
+#   delayed hit: the page is already being loaded for another issuer, so the
+#                reference waits for that read instead of faulting again
+#   frame stall: every frame holds a page still being loaded, so the issuer
+#                waits for the next read to finish and then retries
+# Events (issue / read complete) are kept in a heap ordered by time. Optimal
+# uses the reference string order as its oracle for future uses.
+SERVICE_POLICIES = ("FIFO", "LRU", "Optimal")
+
+
+def simulate_fault_service(pages, capacity, policy="LRU", channels=1, threads=1,
+                           memory_latency=DEFAULT_MEMORY_LATENCY, disk_latency=DEFAULT_DISK_LATENCY):
+    if policy not in SERVICE_POLICIES:
+        raise ValueError("Invalid algorithm")
+    if capacity <= 0 or channels <= 0 or threads <= 0:
+        raise ValueError("Capacity, channels and threads must be positive")
+    pages = list(pages)
+    recency = policy == "LRU"
+    optimal = policy == "Optimal"
+
+    never = len(pages)
+    if optimal:
+        next_use = next_use_table(pages)
+
+    # Issuer t handles references t, t + threads, t + 2 * threads, ...
+    position = list(range(threads))
+    finish = [0.0] * threads
+    stalled = [False] * threads
+    resident = OrderedDict()  # page -> True while its read is outstanding
+    frame = []                # Optimal slot order
+    following = {}
+    waiting = {}              # page being read -> issuers waiting for it
+    io_queue = deque()
+    frame_waiters = deque()
+    events = []
+    sequence = 0
+
+    busy = 0
+    outstanding = 0
+    hits = delayed_hits = faults = stalls = 0
+    max_outstanding = max_queue = 0
+    last_time = 0.0
+    outstanding_area = queue_area = busy_area = 0.0
+
+    def schedule(time, kind, value):
+        nonlocal sequence
+        heapq.heappush(events, (time, sequence, kind, value))
+        sequence += 1
+
+    def start_reads(now):
+        nonlocal busy
+        while io_queue and busy < channels:
+            busy += 1
+            schedule(now + disk_latency, "complete", io_queue.popleft())
+
+    def pick_victim():
+        if optimal:
+            # Pages whose read is still outstanding cannot be evicted
+            return farthest_use_slot(frame, following, never, resident.__getitem__)
+        for candidate, loading in resident.items():
+            if not loading:
+                return candidate
+        return None
+
+    for t in range(min(threads, len(pages))):
+        schedule(0.0, "issue", t)
+
+    while events:
+        now, _, kind, value = heapq.heappop(events)
+        elapsed = now - last_time
+        outstanding_area += outstanding * elapsed
+        queue_area += len(io_queue) * elapsed
+        busy_area += busy * elapsed
+        last_time = now
+
+        if kind == "complete":
+            page = value
+            busy -= 1
+            outstanding -= 1
+            resident[page] = False
+            for t in waiting.pop(page):
+                position[t] += threads
+                schedule(now + memory_latency, "issue", t)
+            start_reads(now)
+            while frame_waiters:
+                schedule(now, "issue", frame_waiters.popleft())
+            continue
+
+        t = value
+        i = position[t]
+        if i >= len(pages):
+            finish[t] = now
+            continue
+        page = pages[i]
+
+        if page in resident:
+            if optimal:
+                following[page] = next_use[i]
+            if recency:
+                resident.move_to_end(page)
+            if resident[page]:
+                delayed_hits += 1
+                waiting[page].append(t)
+            else:
+                hits += 1
+                position[t] += threads
+                schedule(now + memory_latency, "issue", t)
+            continue
+
+        if len(resident) >= capacity:
+            victim = pick_victim()
+            if victim is None:
+                # Counted once per reference, however often it has to retry
+                stalls += not stalled[t]
+                stalled[t] = True
+                frame_waiters.append(t)
+                continue
+            if optimal:
+                slot = victim
+                victim = frame[slot]
+                frame[slot] = page
+                del following[victim]
+            del resident[victim]
+        elif optimal:
+            frame.append(page)
+        if optimal:
+            following[page] = next_use[i]
+        stalled[t] = False
+        resident[page] = True
+        waiting[page] = [t]
+        faults += 1
+        outstanding += 1
+        io_queue.append(page)
+        max_outstanding = max(max_outstanding, outstanding)
+        start_reads(now)
+        max_queue = max(max_queue, len(io_queue))
+
+    completion_time = max(finish, default=0.0)
+    return {
+        "policy": policy,
+        "channels": channels,
+        "threads": threads,
+        "references": len(pages),
+        "page_faults": faults,
+        "hits": hits,
+        "delayed_hits": delayed_hits,
+        "frame_stalls": stalls,
+        "completion_time": completion_time,
+        "max_outstanding_faults": max_outstanding,
+        "mean_outstanding_faults": outstanding_area / completion_time if completion_time else 0.0,
+        "max_queue_depth": max_queue,
+        "mean_queue_depth": queue_area / completion_time if completion_time else 0.0,
+        "channel_utilization": busy_area / (completion_time * channels) if completion_time else 0.0,
+    }
+
+
+def compare_fault_service(pages, capacity, policies=SERVICE_POLICIES, channels=1, threads=1, **latencies):
+    return [simulate_fault_service(pages, capacity, policy, channels, threads, **latencies) for policy in policies]
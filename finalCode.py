@@ -1,177 +1,269 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from collections import deque
-
-class PageReplacementSimulator:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Page Replacement Algorithm Simulator")
-        self.root.geometry("1000x800") 
-        
-        
-        self.input_frame = ttk.Frame(root, padding="10")
-        self.input_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
-        
-        self.result_frame = ttk.Frame(root, padding="10")
-        self.result_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
-        
-        self.root.grid_rowconfigure(1, weight=1)  
-        self.root.grid_rowconfigure(0, weight=0)  
-        self.root.grid_columnconfigure(0, weight=1)
-
-        # Input Section
-        ttk.Label(self.input_frame, text="Page Reference String (comma-separated):").grid(row=0, column=0, padx=5, pady=5)
-        self.page_entry = ttk.Entry(self.input_frame, width=50)
-        self.page_entry.grid(row=0, column=1, padx=5, pady=5)
-        
-        ttk.Label(self.input_frame, text="Frame Size:").grid(row=1, column=0, padx=5, pady=5)
-        self.frame_size = ttk.Entry(self.input_frame, width=10)
-        self.frame_size.grid(row=1, column=1, padx=5, pady=5, sticky="w")
-        
-        ttk.Button(self.input_frame, text="Simulate", command=self.run_simulation).grid(row=2, column=0, columnspan=2, pady=10)
-        
-        # Results Section
-        self.notebook = ttk.Notebook(self.result_frame)
-        self.notebook.pack(fill="both", expand=True)
-        
-        self.tabs = {}
-        for algo in ["FIFO", "LRU", "Optimal"]:
-            frame = ttk.Frame(self.notebook)
-            self.notebook.add(frame, text=algo)
-            self.tabs[algo] = frame
-# this code implements fifo algo.
-    def fifo_algorithm(self, pages, frame_size):
-        frames = []
-        page_faults = 0
-        steps = []
-        
-        for page in pages:
-            current = frames.copy()
-            if page not in frames:
-                if len(frames) < frame_size:
-                    frames.append(page)
-                else:
-                    frames.pop(0)
-                    frames.append(page)
-                page_faults += 1
-            steps.append((current, page, page_faults))
-        return steps, page_faults
-# this code implements lru algo. 
-    def lru_algorithm(self, pages, frame_size):
-        frames = []
-        page_faults = 0
-        steps = []
-        recent = []
-        
-        for page in pages:
-            current = frames.copy()
-            if page not in frames:
-                if len(frames) < frame_size:
-                    frames.append(page)
-                    recent.append(page)
-                else:
-                    lru_page = recent.pop(0)
-                    frames[frames.index(lru_page)] = page
-                    recent.append(page)
-                page_faults += 1
-            else:
-                recent.remove(page)
-                recent.append(page)
-            steps.append((current, page, page_faults))
-        return steps, page_faults
-# this implements optimal algo. 
-    def optimal_algorithm(self, pages, frame_size):
-        frames = []
-        page_faults = 0
-        steps = []
-        
-        for i, page in enumerate(pages):
-            current = frames.copy()
-            if page not in frames:
-                if len(frames) < frame_size:
-                    frames.append(page)
-                else:
-                    future = pages[i+1:]
-                    replace_idx = self.find_optimal_replace(frames, future)
-                    frames[replace_idx] = page
-                page_faults += 1
-            steps.append((current, page, page_faults))
-        return steps, page_faults
-
-    def find_optimal_replace(self, frames, future):
-        distances = []
-        for frame in frames:
-            try:
-                distances.append(future.index(frame))
-            except ValueError:
-                return frames.index(frame)
-        return np.argmax(distances)
-
-    def create_visualization(self, algo, steps, total_faults, pages, frame_size):
-        for widget in self.tabs[algo].winfo_children():
-            widget.destroy()
-        
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), height_ratios=[1, 1])  # Adjusted figure size
-        
-        # Memory state matrix
-        states = np.zeros((frame_size, len(pages)))
-        for i, (current, page, _) in enumerate(steps):
-            for j in range(min(frame_size, len(current))):
-                states[j, i] = current[j] if current[j] else 0
-        
-        cax = ax1.matshow(states, cmap='viridis')
-        fig.colorbar(cax, ax=ax1)
-        ax1.set_title(f"{algo} - Memory States")
-        ax1.set_xlabel("Reference Number")
-        ax1.set_ylabel("Frame Number")
-        
-        # Page Faults Plot with Metrics
-        faults = [step[2] for step in steps]
-        ax2.plot(faults, 'r.-', label='Page Faults')
-        #ax2.set_title(f"Page Faults Over Time (Total: {total_faults})")
-        ax2.set_xlabel("Reference Number")
-        ax2.set_ylabel("Fault Count")
-        ax2.legend()
-        
-        # Step 4: Performance Metrics
-        hit_ratio = 1 - (total_faults / len(pages))
-        miss_ratio = 1 - hit_ratio
-        metrics_text = (f"Hit Ratio: {hit_ratio:.2%}\n"
-                       f"Miss Ratio: {miss_ratio:.2%}\n"
-                       f"Total Faults: {total_faults}")
-        ax2.text(0.02, 0.98, metrics_text, transform=ax2.transAxes, 
-                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-        
-        plt.tight_layout(pad=3.0)  # Increased padding to prevent overlap
-        canvas = FigureCanvasTkAgg(fig, master=self.tabs[algo])
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    def run_simulation(self):
-        try:
-            pages = [int(x.strip()) for x in self.page_entry.get().split(',')]
-            frame_size = int(self.frame_size.get())
-            
-            if frame_size <= 0 or not pages:
-                raise ValueError("Invalid input")
-            
-            fifo_steps, fifo_faults = self.fifo_algorithm(pages, frame_size)
-            lru_steps, lru_faults = self.lru_algorithm(pages, frame_size)
-            opt_steps, opt_faults = self.optimal_algorithm(pages, frame_size)
-            
-            self.create_visualization("FIFO", fifo_steps, fifo_faults, pages, frame_size)
-            self.create_visualization("LRU", lru_steps, lru_faults, pages, frame_size)
-            self.create_visualization("Optimal", opt_steps, opt_faults, pages, frame_size)
-            
-        except ValueError as e:
-            messagebox.showerror("Error", f"Invalid input: {str(e)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = PageReplacementSimulator(root)
+import tkinter as tk
+from tkinter import ttk, messagebox
+from collections import deque
+from cost_model import simulate_costs
+from fault_rate import FaultRateMonitor
+from locality import analyze_locality
+from page_replacement import parse_reference_string
+
+class PageReplacementSimulator:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Page Replacement Algorithm Simulator")
+        self.root.geometry("1000x800") 
+        
+        
+        self.input_frame = ttk.Frame(root, padding="10")
+        self.input_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+        
+        self.result_frame = ttk.Frame(root, padding="10")
+        self.result_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+        
+        self.root.grid_rowconfigure(1, weight=1)  
+        self.root.grid_rowconfigure(0, weight=0)  
+        self.root.grid_columnconfigure(0, weight=1)
+
+        # Input Section
+        ttk.Label(self.input_frame, text="Page Reference String (comma-separated, 3w = write):").grid(row=0, column=0, padx=5, pady=5)
+        self.page_entry = ttk.Entry(self.input_frame, width=50)
+        self.page_entry.grid(row=0, column=1, padx=5, pady=5)
+        
+        ttk.Label(self.input_frame, text="Frame Size:").grid(row=1, column=0, padx=5, pady=5)
+        self.frame_size = ttk.Entry(self.input_frame, width=10)
+        self.frame_size.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        
+        ttk.Button(self.input_frame, text="Simulate", command=self.run_simulation).grid(row=2, column=0, columnspan=2, pady=10)
+        
+        # Results Section
+        self.notebook = ttk.Notebook(self.result_frame)
+        self.notebook.pack(fill="both", expand=True)
+        
+        self.tabs = {}
+        for algo in ["FIFO", "LRU", "Optimal"]:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=algo)
+            self.tabs[algo] = frame
+
+        # Last reference string and steps per algorithm, used to resume
+        # simulations when only the tail of the reference string changes
+        self.previous_runs = {}
+# this code implements fifo algo.
+    def fifo_algorithm(self, pages, frame_size, start=0, frames=None, page_faults=0):
+        frames = list(frames or [])
+        steps = []
+        
+        for page in pages[start:]:
+            current = frames.copy()
+            if page not in frames:
+                if len(frames) < frame_size:
+                    frames.append(page)
+                else:
+                    frames.pop(0)
+                    frames.append(page)
+                page_faults += 1
+            steps.append((current, page, page_faults))
+        return steps, page_faults
+# this code implements lru algo. 
+    def lru_algorithm(self, pages, frame_size, start=0, frames=None, page_faults=0, recent=None):
+        frames = list(frames or [])
+        steps = []
+        recent = list(recent or [])
+        
+        for page in pages[start:]:
+            current = frames.copy()
+            if page not in frames:
+                if len(frames) < frame_size:
+                    frames.append(page)
+                    recent.append(page)
+                else:
+                    lru_page = recent.pop(0)
+                    frames[frames.index(lru_page)] = page
+                    recent.append(page)
+                page_faults += 1
+            else:
+                recent.remove(page)
+                recent.append(page)
+            steps.append((current, page, page_faults))
+        return steps, page_faults
+# this implements optimal algo. 
+    def optimal_algorithm(self, pages, frame_size):
+        frames = []
+        page_faults = 0
+        steps = []
+        
+        for i, page in enumerate(pages):
+            current = frames.copy()
+            if page not in frames:
+                if len(frames) < frame_size:
+                    frames.append(page)
+                else:
+                    future = pages[i+1:]
+                    replace_idx = self.find_optimal_replace(frames, future)
+                    frames[replace_idx] = page
+                page_faults += 1
+            steps.append((current, page, page_faults))
+        return steps, page_faults
+
+    def find_optimal_replace(self, frames, future):
+        distances = []
+        for frame in frames:
+            try:
+                distances.append(future.index(frame))
+            except ValueError:
+                return frames.index(frame)
+        return distances.index(max(distances))
+
+    def resume_algorithm(self, algo, pages, frame_size):
+        # Each step records the frames before its reference, so every step in
+        # the prefix shared with the previous run is a checkpoint to resume from.
+        # Optimal depends on the whole future and is only reused unchanged.
+        frame_size_before, old_pages, old_steps = self.previous_runs.get(algo, (None, [], []))
+        start = 0
+        if frame_size_before == frame_size:
+            limit = min(len(old_pages), len(pages))
+            while start < limit and old_pages[start] == pages[start]:
+                start += 1
+            if algo == "Optimal" and not (start == len(old_pages) == len(pages)):
+                start = 0
+
+        if start == len(pages):
+            steps = old_steps[:start]
+        elif algo in ("FIFO", "LRU") and start:
+            # The state after the last old reference is not stored, so resume
+            # one reference early when the string was only appended to
+            start = min(start, len(old_steps) - 1)
+            frames = old_steps[start][0]
+            page_faults = old_steps[start - 1][2] if start else 0
+            if algo == "FIFO":
+                new_steps, _ = self.fifo_algorithm(pages, frame_size, start, frames, page_faults)
+            else:
+                # Recency order of the resident pages, from their last use in the prefix
+                recent = []
+                for page in reversed(pages[:start]):
+                    if page in frames and page not in recent:
+                        recent.append(page)
+                        if len(recent) == len(frames):
+                            break
+                recent.reverse()
+                new_steps, _ = self.lru_algorithm(pages, frame_size, start, frames, page_faults, recent)
+            steps = old_steps[:start] + new_steps
+        else:
+            algorithm = {"FIFO": self.fifo_algorithm, "LRU": self.lru_algorithm, "Optimal": self.optimal_algorithm}[algo]
+            steps, _ = algorithm(pages, frame_size)
+
+        self.previous_runs[algo] = (frame_size, list(pages), steps)
+        return steps, steps[-1][2] if steps else 0
+
+    def create_visualization(self, algo, steps, total_faults, pages, frame_size, cost=None, locality=None):
+        for widget in self.tabs[algo].winfo_children():
+            widget.destroy()
+        
+        # Plotting libraries are only loaded once the first chart is drawn
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import numpy as np
+        from downsample import lttb_indices, binned_states, MAX_CURVE_POINTS
+        
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), height_ratios=[1, 1])  # Adjusted figure size
+        
+        # Memory state matrix; long traces get one column per equal-width bin
+        # of references, showing the most frequent page of each frame slot
+        states = binned_states([step[0] for step in steps], frame_size)
+        
+        if states.shape[1] < len(steps):
+            cax = ax1.matshow(states, cmap='viridis', aspect='auto',
+                              extent=(-0.5, len(steps) - 0.5, frame_size - 0.5, -0.5))
+            bin_width = len(steps) / states.shape[1]
+            ax1.set_title(f"{algo} - Memory States (most frequent page per {bin_width:.0f}-reference bin)")
+        else:
+            cax = ax1.matshow(states, cmap='viridis')
+            ax1.set_title(f"{algo} - Memory States")
+        fig.colorbar(cax, ax=ax1)
+        ax1.set_xlabel("Reference Number")
+        ax1.set_ylabel("Frame Number")
+        
+        # Page Faults Plot with Metrics
+        faults = np.array([step[2] for step in steps])
+        if len(faults) > MAX_CURVE_POINTS:
+            # Downsampled line without per-point markers
+            kept = lttb_indices(faults)
+            ax2.plot(kept, faults[kept], 'r-', label='Page Faults')
+        else:
+            ax2.plot(faults, 'r.-', label='Page Faults')
+        #ax2.set_title(f"Page Faults Over Time (Total: {total_faults})")
+        ax2.set_xlabel("Reference Number")
+        ax2.set_ylabel("Fault Count")
+        ax2.legend()
+        
+        # Sliding-window fault rate on a second axis, plus detected phases
+        monitor = FaultRateMonitor(window=max(min(len(steps) // 10, 100), 2),
+                                   sample_every=max(len(steps) // MAX_CURVE_POINTS, 1))
+        previous = 0
+        for _, _, fault_count in steps:
+            monitor.update(fault_count - previous)
+            previous = fault_count
+        monitor.on_end()
+        ax3 = ax2.twinx()
+        ax3.plot([index for index, _, _ in monitor.series], [rate for _, rate, _ in monitor.series],
+                 'b-', alpha=0.5, label=f'Fault Rate ({monitor.window} refs)')
+        ax3.set_ylim(0, 1.05)
+        ax3.set_ylabel("Window Fault Rate")
+        ax3.legend(loc='center right')
+        # Keep the fault curve and metrics box in front of the rate line
+        ax3.set_zorder(ax2.get_zorder() - 1)
+        ax2.patch.set_visible(False)
+        
+        # Step 4: Performance Metrics
+        hit_ratio = 1 - (total_faults / len(pages))
+        miss_ratio = 1 - hit_ratio
+        metrics_text = (f"Hit Ratio: {hit_ratio:.2%}\n"
+                       f"Miss Ratio: {miss_ratio:.2%}\n"
+                       f"Total Faults: {total_faults}")
+        if cost is not None:
+            metrics_text += (f"\nWrite-backs: {cost['write_backs']}\n"
+                             f"Eff. Access Time: {cost['effective_access_time'] / 1000:.2f} µs")
+        rate_summary = monitor.summary()
+        metrics_text += (f"\nPeak Window Fault Rate: {rate_summary['peak_window_fault_rate']:.2%}\n"
+                         f"Phases: {rate_summary['phases']} ({rate_summary['thrashing_references']} refs thrashing)")
+        if locality is not None:
+            median = locality["median_reuse_distance"]
+            metrics_text += (f"\nCold Misses: {locality['cold_misses']}\n"
+                             f"Median Reuse Distance: {median if median is not None else '-'}\n"
+                             f"Mean Working Set: {locality['mean_working_set']:.2f}")
+        ax2.text(0.02, 0.98, metrics_text, transform=ax2.transAxes, 
+                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+        
+        plt.tight_layout(pad=3.0)  # Increased padding to prevent overlap
+        canvas = FigureCanvasTkAgg(fig, master=self.tabs[algo])
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def run_simulation(self):
+        try:
+            pages, writes = parse_reference_string(self.page_entry.get())
+            frame_size = int(self.frame_size.get())
+            
+            if frame_size <= 0 or not pages:
+                raise ValueError("Invalid input")
+            
+            fifo_steps, fifo_faults = self.resume_algorithm("FIFO", pages, frame_size)
+            lru_steps, lru_faults = self.resume_algorithm("LRU", pages, frame_size)
+            opt_steps, opt_faults = self.resume_algorithm("Optimal", pages, frame_size)
+            locality = analyze_locality(pages, frame_size)
+            
+            self.create_visualization("FIFO", fifo_steps, fifo_faults, pages, frame_size,
+                                      simulate_costs(pages, writes, frame_size, "FIFO", compact=True), locality)
+            self.create_visualization("LRU", lru_steps, lru_faults, pages, frame_size,
+                                      simulate_costs(pages, writes, frame_size, "LRU", compact=True), locality)
+            self.create_visualization("Optimal", opt_steps, opt_faults, pages, frame_size,
+                                      simulate_costs(pages, writes, frame_size, "Optimal", compact=True), locality)
+            
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {str(e)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = PageReplacementSimulator(root)
     root.mainloop()
\ No newline at end of file
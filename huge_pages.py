@@ -0,0 +1,218 @@
+import heapq
+import math
+from collections import OrderedDict
+from engine_hooks import next_use_table
+
+# -------------------------
+# Mixed Page Sizes (Huge Pages)
+# -------------------------
+# Memory is `capacity` bytes instead of a number of frames, and a page is a
+# unit of any size. A fault evicts units (FIFO, LRU or Optimal order) until the
+# new unit fits. Two ways to get sized units:
+#   explicit sizes: the trace gives each page's size in bytes
+#   promotion:      pages are base (4K) page numbers; once `density` of the
+#                   base pages of a huge-page region (2M = 512 base pages) have
+#                   been referenced, the region becomes one huge page. The
+#                   reference that promotes a region loads the whole huge page
+#                   (one fault) and releases the region's resident base pages.
+#                   Promotion is permanent, like a huge page mapping.
+# Internal fragmentation is the part of resident huge pages whose base pages
+# have not been referenced since the huge page was loaded (base pages that led
+# to a promotion count as referenced). Optimal evicts the
+# unit used farthest in the future first; with mixed sizes this is Belady's
+# rule, a strong heuristic rather than a guaranteed minimum.
+SIZE_POLICIES = ("FIFO", "LRU", "Optimal")
+BASE_PAGE_SIZE = 4 * 1024
+HUGE_PAGE_SIZE = 2 * 1024 * 1024
+DEFAULT_DENSITY = 0.5
+_SIZE_SUFFIXES = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(size):
+    # "4K" / "2M" / "1G" / "4096" / 4096 -> bytes
+    if isinstance(size, str):
+        text = size.strip().upper().rstrip("B")
+        multiplier = 1
+        if text[-1:] in _SIZE_SUFFIXES:
+            multiplier = _SIZE_SUFFIXES[text[-1]]
+            text = text[:-1]
+        try:
+            size = int(text) * multiplier
+        except ValueError:
+            raise ValueError(f"Invalid size '{size}', expected bytes or a K/M/G suffix") from None
+    if size <= 0:
+        raise ValueError(f"Size must be positive, got {size}")
+    return int(size)
+
+
+def promote_regions(pages, density=DEFAULT_DENSITY, huge_pages=HUGE_PAGE_SIZE // BASE_PAGE_SIZE):
+    # Maps base page references to units. Returns per reference: the unit
+    # ((first base page, base pages) tuples), the base page within a huge unit
+    # (None for base units) and, for the reference that promotes a region, the
+    # region's base pages referenced so far (None otherwise). Those base pages
+    # are released as base units and count as touched in the new huge page.
+    # density=None never promotes.
+    threshold = None if density is None else max(1, math.ceil(density * huge_pages))
+    touched = {}  # region -> distinct base pages referenced so far
+    huge = set()
+    units = []
+    subpages = []
+    promoted = []
+    for page in pages:
+        region = page // huge_pages
+        if region in huge:
+            units.append((region * huge_pages, huge_pages))
+            subpages.append(page)
+            promoted.append(None)
+            continue
+        seen = touched.setdefault(region, set())
+        seen.add(page)
+        if threshold is None or len(seen) < threshold:
+            units.append((page, 1))
+            subpages.append(None)
+            promoted.append(None)
+            continue
+        huge.add(region)
+        del touched[region]
+        units.append((region * huge_pages, huge_pages))
+        subpages.append(page)
+        promoted.append(seen)
+    return units, subpages, promoted
+
+
+def _simulate_units(units, sizes, capacity, policy, subpages=None, promoted=None, base_size=BASE_PAGE_SIZE):
+    if policy not in SIZE_POLICIES:
+        raise ValueError("Invalid algorithm")
+    if capacity <= 0:
+        raise ValueError("Capacity must be positive")
+    optimal = policy == "Optimal"
+    if optimal:
+        next_use = next_use_table(units)
+        following = {}
+        heap = []  # (-next use, unit), stale entries skipped lazily
+
+    resident = OrderedDict()  # unit -> size, FIFO/LRU order
+    touched = {}              # resident huge unit -> base pages referenced
+    used = fragmentation = 0
+    faults = huge_faults = evictions = promotions = 0
+    bytes_loaded = 0
+    used_area = fragmentation_area = 0
+    peak_used = peak_fragmentation = 0
+
+    def release(unit):
+        nonlocal used, fragmentation
+        size = resident.pop(unit)
+        used -= size
+        if unit in touched:
+            fragmentation -= size - len(touched.pop(unit)) * base_size
+        if optimal:
+            del following[unit]
+
+    def pick_victim():
+        if not optimal:
+            return next(iter(resident))
+        while True:
+            negative_use, victim = heapq.heappop(heap)
+            if following.get(victim) == -negative_use:
+                return victim
+
+    for i, unit in enumerate(units):
+        size = sizes[i]
+        if unit in resident:
+            if policy == "LRU":
+                resident.move_to_end(unit)
+        else:
+            if size > capacity:
+                raise ValueError(f"A {size}-byte page does not fit in {capacity} bytes of memory")
+            faults += 1
+            bytes_loaded += size
+            seen = None if promoted is None else promoted[i]
+            if seen is not None:
+                promotions += 1
+                for base in seen:
+                    if (base, 1) in resident:
+                        release((base, 1))
+            while used + size > capacity:
+                release(pick_victim())
+                evictions += 1
+            resident[unit] = size
+            used += size
+            if subpages is not None and subpages[i] is not None:
+                huge_faults += 1
+                touched[unit] = set(seen or ())
+                fragmentation += size - len(touched[unit]) * base_size
+        if optimal:
+            following[unit] = next_use[i]
+            heapq.heappush(heap, (-next_use[i], unit))
+        if subpages is not None and subpages[i] is not None and subpages[i] not in touched[unit]:
+            touched[unit].add(subpages[i])
+            fragmentation -= base_size
+        used_area += used
+        fragmentation_area += fragmentation
+        peak_used = max(peak_used, used)
+        peak_fragmentation = max(peak_fragmentation, fragmentation)
+
+    references = len(units)
+    mean_used = used_area / references if references else 0.0
+    mean_fragmentation = fragmentation_area / references if references else 0.0
+    return {
+        "policy": policy,
+        "capacity_bytes": capacity,
+        "references": references,
+        "page_faults": faults,
+        "huge_page_faults": huge_faults,
+        "promotions": promotions,
+        "evictions": evictions,
+        "bytes_loaded": bytes_loaded,
+        "mean_memory_used": mean_used,
+        "peak_memory_used": peak_used,
+        "memory_utilization": mean_used / capacity * 100,
+        "mean_internal_fragmentation": mean_fragmentation,
+        "peak_internal_fragmentation": peak_fragmentation,
+        "fragmentation_ratio": mean_fragmentation / mean_used if mean_used else 0.0,
+    }
+
+
+def simulate_sized_pages(pages, sizes, capacity, policy="LRU"):
+    # `sizes` is a {page: bytes} mapping or one size per reference. Without
+    # sub-page references there is no fragmentation to measure, so those
+    # fields are None
+    pages = list(pages)
+    if isinstance(sizes, dict):
+        sizes = [parse_size(sizes[page]) for page in pages]
+    else:
+        sizes = [parse_size(size) for size in sizes]
+        if len(sizes) != len(pages):
+            raise ValueError("Expected one size per reference")
+        first = {}
+        for page, size in zip(pages, sizes):
+            if first.setdefault(page, size) != size:
+                raise ValueError(f"Page {page} is referenced with sizes {first[page]} and {size}")
+    result = _simulate_units(pages, sizes, parse_size(capacity), policy)
+    for key in ("huge_page_faults", "promotions", "mean_internal_fragmentation", "peak_internal_fragmentation",
+                "fragmentation_ratio"):
+        result[key] = None
+    return result
+
+
+def simulate_huge_pages(pages, capacity, policy="LRU", density=DEFAULT_DENSITY, base_size=BASE_PAGE_SIZE,
+                        huge_size=HUGE_PAGE_SIZE):
+    # Base page numbers with promotion of dense regions; density=None keeps
+    # every page at base size (the baseline to compare against)
+    base_size = parse_size(base_size)
+    huge_size = parse_size(huge_size)
+    if huge_size % base_size or huge_size == base_size:
+        raise ValueError("Huge page size must be a multiple of the base page size")
+    if density is not None and not 0 <= density <= 1:
+        raise ValueError("Density must be between 0 and 1")
+    units, subpages, promoted = promote_regions(pages, density, huge_size // base_size)
+    sizes = [count * base_size for _, count in units]
+    result = _simulate_units(units, sizes, parse_size(capacity), policy, subpages, promoted, base_size)
+    result["density"] = density
+    return result
+
+
+def compare_huge_pages(pages, capacity, policies=SIZE_POLICIES, density=DEFAULT_DENSITY, **sizes):
+    # Base pages only vs. promotion, per policy, to see whether huge pages pay off
+    return [simulate_huge_pages(pages, capacity, policy, mode, **sizes)
+            for policy in policies for mode in (None, density)]
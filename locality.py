@@ -0,0 +1,169 @@
+from collections import deque
+
+# -------------------------
+# Locality Analysis
+# -------------------------
+# Policy-independent statistics of a reference string, all in O(n log n):
+#   reuse distance: distinct pages touched between two references to the same
+#                   page (Fenwick tree over timestamps). LRU with c frames hits
+#                   exactly the reuses with distance < c, so the histogram is
+#                   also the whole LRU fault curve.
+#   working set:    distinct pages in the last `window` references, W(t, window)
+#   gaps:           references between consecutive uses of each page
+DEFAULT_WINDOW = 10
+
+
+class StackDistanceTracker:
+    # LRU stack distances with a Fenwick tree over access timestamps. Only the
+    # latest access of every page is marked, so the distance of a reuse is the
+    # number of marks after the page's previous timestamp. Timestamps are
+    # renumbered when the tree fills up, so memory follows the live page count.
+    def __init__(self, size=1024):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.clock = 0
+        self.last = {}
+
+    def _add(self, index, delta):
+        tree = self.tree
+        size = self.size
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def _prefix(self, index):
+        tree = self.tree
+        total = 0
+        while index:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def _compact(self):
+        live = sorted(self.last, key=self.last.__getitem__)
+        self.size = max(self.size, 2 * len(live))
+        self.tree = [0] * (self.size + 1)
+        for stamp, page in enumerate(live, 1):
+            self.last[page] = stamp
+        # Linear-time Fenwick build with the first len(live) slots marked
+        tree = self.tree
+        for index in range(1, self.size + 1):
+            if index <= len(live):
+                tree[index] += 1
+            parent = index + (index & -index)
+            if parent <= self.size:
+                tree[parent] += tree[index]
+        self.clock = len(live)
+
+    def access(self, page):
+        # Returns the number of distinct pages touched since the previous
+        # access to page, or None on first access
+        if self.clock == self.size:
+            self._compact()
+        previous = self.last.get(page)
+        distance = None
+        if previous is not None:
+            distance = len(self.last) - self._prefix(previous)
+            self._add(previous, -1)
+        self.clock += 1
+        self._add(self.clock, 1)
+        self.last[page] = self.clock
+        return distance
+
+    def remove(self, page):
+        self._add(self.last.pop(page), -1)
+
+
+def reuse_distances(pages):
+    # Reuse distance of every reference, None for first references
+    tracker = StackDistanceTracker()
+    return [tracker.access(page) for page in pages]
+
+
+def reuse_distance_histogram(pages):
+    # Returns (histogram {distance: count}, cold references)
+    histogram = {}
+    cold = 0
+    tracker = StackDistanceTracker()
+    for page in pages:
+        distance = tracker.access(page)
+        if distance is None:
+            cold += 1
+        else:
+            histogram[distance] = histogram.get(distance, 0) + 1
+    return histogram, cold
+
+
+def lru_faults(histogram, cold, capacities):
+    # LRU fault count for every capacity from one reuse-distance histogram
+    return [cold + sum(count for distance, count in histogram.items() if distance >= capacity)
+            for capacity in capacities]
+
+
+def working_set_sizes(pages, window=DEFAULT_WINDOW):
+    # W(t, window) after every reference, sliding a window of page counts
+    if window <= 0:
+        raise ValueError("Window must be positive")
+    counts = {}
+    recent = deque()
+    sizes = []
+    for page in pages:
+        counts[page] = counts.get(page, 0) + 1
+        recent.append(page)
+        if len(recent) > window:
+            old = recent.popleft()
+            counts[old] -= 1
+            if not counts[old]:
+                del counts[old]
+        sizes.append(len(counts))
+    return sizes
+
+
+def inter_reference_gaps(pages):
+    # page -> (references, mean gap, max gap); gaps are None for pages used once
+    last = {}
+    stats = {}
+    for i, page in enumerate(pages):
+        references, total, largest = stats.get(page, (0, 0, 0))
+        if page in last:
+            gap = i - last[page]
+            total += gap
+            largest = max(largest, gap)
+        stats[page] = (references + 1, total, largest)
+        last[page] = i
+    return {page: (references, total / (references - 1) if references > 1 else None,
+                   largest if references > 1 else None)
+            for page, (references, total, largest) in stats.items()}
+
+
+def analyze_locality(pages, capacity, window=DEFAULT_WINDOW):
+    # Summary used by the apps next to the policy results
+    pages = list(pages)
+    histogram, cold = reuse_distance_histogram(pages)
+    sizes = working_set_sizes(pages, window) if pages else []
+    gaps = inter_reference_gaps(pages)
+    reuses = len(pages) - cold
+    ordered = sorted(histogram)
+    median = None
+    seen = 0
+    for distance in ordered:
+        seen += histogram[distance]
+        if 2 * seen >= reuses:
+            median = distance
+            break
+    mean_gaps = [mean for _, mean, _ in gaps.values() if mean is not None]
+    return {
+        "references": len(pages),
+        "unique_pages": len(gaps),
+        "cold_misses": cold,
+        "reuse_histogram": histogram,
+        "median_reuse_distance": median,
+        "reuses_within_capacity": sum(count for distance, count in histogram.items() if distance < capacity),
+        "lru_faults": lru_faults(histogram, cold, [capacity])[0],
+        "window": window,
+        "working_set_sizes": sizes,
+        "mean_working_set": sum(sizes) / len(sizes) if sizes else 0.0,
+        "peak_working_set": max(sizes, default=0),
+        "mean_gap": sum(mean_gaps) / len(mean_gaps) if mean_gaps else None,
+        "gaps": gaps,
+    }
@@ -0,0 +1,132 @@
+import time
+from engine_hooks import run_instrumented
+
+# -------------------------
+# Page Replacement Functions
+# -------------------------
+def fifo_page_replacement(pages, capacity, initial_frame=None, hooks=None):
+    # initial_frame resumes from a saved frame state (see checkpoint.py)
+    if hooks is not None:
+        return _run_with_hooks("FIFO", pages, capacity, hooks, initial_frame)
+    frame = list(initial_frame) if initial_frame else []
+    page_faults = 0
+    steps = []
+    hit_miss = []
+    response_times = []
+    
+    start_time = time.time()
+    for page in pages:
+        req_time = time.time()
+        if page not in frame:
+            if len(frame) < capacity:
+                frame.append(page)
+            else:
+                frame.pop(0)
+                frame.append(page)
+            page_faults += 1
+            hit_miss.append("Miss")
+        else:
+            hit_miss.append("Hit")
+        steps.append(list(frame))
+        response_times.append(time.time() - req_time)
+    
+    execution_time = time.time() - start_time
+    memory_utilization = (len(set(pages)) / capacity) * 100
+    return page_faults, steps, hit_miss, execution_time, response_times, memory_utilization
+
+def lru_page_replacement(pages, capacity, initial_frame=None, hooks=None):
+    # initial_frame resumes from a saved frame state (see checkpoint.py)
+    if hooks is not None:
+        return _run_with_hooks("LRU", pages, capacity, hooks, initial_frame)
+    frame = list(initial_frame) if initial_frame else []
+    page_faults = 0
+    steps = []
+    hit_miss = []
+    response_times = []
+    
+    start_time = time.time()
+    for page in pages:
+        req_time = time.time()
+        if page not in frame:
+            if len(frame) < capacity:
+                frame.append(page)
+            else:
+                frame.pop(0)
+                frame.append(page)
+            page_faults += 1
+            hit_miss.append("Miss")
+        else:
+            frame.remove(page)
+            frame.append(page)
+            hit_miss.append("Hit")
+        steps.append(list(frame))
+        response_times.append(time.time() - req_time)
+    
+    execution_time = time.time() - start_time
+    memory_utilization = (len(set(pages)) / capacity) * 100
+    return page_faults, steps, hit_miss, execution_time, response_times, memory_utilization
+
+def optimal_page_replacement(pages, capacity, hooks=None):
+    if hooks is not None:
+        return _run_with_hooks("Optimal", pages, capacity, hooks)
+    frame = []
+    page_faults = 0
+    steps = []
+    hit_miss = []
+    response_times = []
+    
+    start_time = time.time()
+    for i, page in enumerate(pages):
+        req_time = time.time()
+        if page not in frame:
+            if len(frame) < capacity:
+                frame.append(page)
+            else:
+                future_pages = pages[i+1:]
+                farthest = -1
+                index_to_replace = 0
+                for index, f_page in enumerate(frame):
+                    if f_page in future_pages:
+                        next_use = future_pages.index(f_page)
+                        if next_use > farthest:
+                            farthest = next_use
+                            index_to_replace = index
+                    else:
+                        index_to_replace = index
+                        break
+                frame[index_to_replace] = page
+            page_faults += 1
+            hit_miss.append("Miss")
+        else:
+            hit_miss.append("Hit")
+        steps.append(list(frame))
+        response_times.append(time.time() - req_time)
+    
+    execution_time = time.time() - start_time
+    memory_utilization = (len(set(pages)) / capacity) * 100
+    return page_faults, steps, hit_miss, execution_time, response_times, memory_utilization
+
+def _run_with_hooks(algorithm, pages, capacity, hooks, initial_frame=None):
+    # Hooked runs use the instrumented engine so the loops above never pay
+    # for event dispatch when no hooks are registered
+    result = run_instrumented(algorithm, pages, capacity, hooks, initial_frame=initial_frame)
+    memory_utilization = (len(set(pages)) / capacity) * 100
+    return (result["page_faults"], result["steps"], result["hit_miss"], result["execution_time"],
+            result["response_times"], memory_utilization)
+
+# -------------------------
+# Reference String Parsing
+# -------------------------
+def parse_reference_string(text):
+    # "7, 0w, 1" -> pages [7, 0, 1] and write flags [False, True, False];
+    # a trailing "w" marks a write, a trailing "r" or nothing a read
+    pages = []
+    writes = []
+    for token in text.split(','):
+        token = token.strip()
+        write = token[-1:] in ("w", "W")
+        if token[-1:] in ("w", "W", "r", "R"):
+            token = token[:-1].strip()
+        pages.append(int(token))
+        writes.append(write)
+    return pages, writes
@@ -0,0 +1,200 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from engine_hooks import farthest_use_slot
+
+# -------------------------
+# Prefetching Policies
+# -------------------------
+# A prefetcher watches the demand reference stream and proposes pages to load
+# speculatively: observe(page, miss) -> list of pages. simulate_prefetch runs a
+# FIFO/LRU/Optimal frame set with those speculative loads and reports:
+#   accuracy  = useful prefetches / prefetches issued
+#   coverage  = useful prefetches / (useful prefetches + remaining demand faults)
+#   pollution = evictions caused by prefetches (and how many of the evicted
+#               pages were demand-faulted back in later)
+# A prefetch is "useful" when the page is referenced before it is evicted.
+PREFETCH_POLICIES = ("FIFO", "LRU", "Optimal")
+
+
+class SequentialPrefetcher:
+    # Next-N: on every demand fault, fetch the next `degree` pages
+    def __init__(self, degree=1):
+        self.degree = degree
+
+    def observe(self, page, miss):
+        if not miss:
+            return []
+        return [page + offset for offset in range(1, self.degree + 1)]
+
+
+class StridePrefetcher:
+    # Fetches `degree` pages ahead once the same non-zero stride has been seen
+    # `confidence` times in a row
+    def __init__(self, degree=1, confidence=2):
+        self.degree = degree
+        self.confidence = confidence
+        self.last_page = None
+        self.stride = 0
+        self.repeats = 0
+
+    def observe(self, page, miss):
+        if self.last_page is not None:
+            stride = page - self.last_page
+            if stride == self.stride and stride != 0:
+                self.repeats += 1
+            else:
+                self.stride = stride
+                self.repeats = 1 if stride != 0 else 0
+        self.last_page = page
+        if self.repeats < self.confidence:
+            return []
+        return [page + self.stride * step for step in range(1, self.degree + 1)]
+
+
+class MarkovPrefetcher:
+    # First-order history table: page -> successors seen after it, most recent
+    # first, at most `width` per page. On a fault the `degree` most recent
+    # successors of the faulting page are fetched
+    def __init__(self, degree=1, width=4):
+        self.degree = degree
+        self.width = width
+        self.table = {}
+        self.last_page = None
+
+    def observe(self, page, miss):
+        if self.last_page is not None and self.last_page != page:
+            successors = self.table.setdefault(self.last_page, [])
+            if page in successors:
+                successors.remove(page)
+            successors.insert(0, page)
+            del successors[self.width:]
+        self.last_page = page
+        if not miss:
+            return []
+        return self.table.get(page, [])[:self.degree]
+
+
+PREFETCHERS = {
+    "Sequential": SequentialPrefetcher,
+    "Stride": StridePrefetcher,
+    "Markov": MarkovPrefetcher,
+}
+
+
+def make_prefetcher(name, degree=1):
+    if name not in PREFETCHERS:
+        raise ValueError(f"Unknown prefetcher '{name}', expected one of {', '.join(PREFETCHERS)}")
+    return PREFETCHERS[name](degree)
+
+
+def simulate_prefetch(pages, capacity, policy="LRU", prefetcher=None):
+    if policy not in PREFETCH_POLICIES:
+        raise ValueError("Invalid algorithm")
+    if capacity <= 0:
+        raise ValueError("Capacity must be positive")
+    pages = list(pages)
+    optimal = policy == "Optimal"
+    recency = policy == "LRU"
+    never = len(pages)
+
+    if optimal:
+        # Next use of any page after position i, for demand and prefetched pages
+        positions = {}
+        for i, page in enumerate(pages):
+            positions.setdefault(page, []).append(i)
+
+        def next_use(page, i):
+            occurrences = positions.get(page)
+            if not occurrences:
+                return never
+            k = bisect_right(occurrences, i)
+            return occurrences[k] if k < len(occurrences) else never
+
+    # page -> True while it was prefetched and not referenced yet
+    resident = OrderedDict()
+    frame = []
+    following = {}
+    demand_faults = 0
+    issued = 0
+    useful = 0
+    unused_evicted = 0
+    prefetch_evictions = 0
+    evicted_by_prefetch = set()
+    polluting = 0
+    hit_miss = []
+
+    def load(page, i, speculative):
+        nonlocal unused_evicted, prefetch_evictions
+        if len(resident) >= capacity:
+            if optimal:
+                slot = farthest_use_slot(frame, following, never)
+                victim = frame[slot]
+                frame[slot] = page
+                del following[victim]
+            else:
+                victim = next(iter(resident))
+            unused_evicted += resident.pop(victim)
+            if speculative:
+                prefetch_evictions += 1
+                evicted_by_prefetch.add(victim)
+        elif optimal:
+            frame.append(page)
+        resident[page] = speculative
+        if optimal:
+            following[page] = next_use(page, i)
+
+    for i, page in enumerate(pages):
+        if page in resident:
+            if resident[page]:
+                useful += 1
+                resident[page] = False
+            if recency:
+                resident.move_to_end(page)
+            if optimal:
+                following[page] = next_use(page, i)
+            hit_miss.append("Hit")
+            miss = False
+        else:
+            demand_faults += 1
+            if page in evicted_by_prefetch:
+                polluting += 1
+            load(page, i, False)
+            hit_miss.append("Miss")
+            miss = True
+        evicted_by_prefetch.discard(page)
+
+        if prefetcher is not None:
+            for candidate in prefetcher.observe(page, miss):
+                if candidate < 0 or candidate in resident:
+                    continue
+                issued += 1
+                load(candidate, i, True)
+                evicted_by_prefetch.discard(candidate)
+
+    return {
+        "policy": policy,
+        "references": len(pages),
+        "page_faults": demand_faults,
+        "prefetches": issued,
+        "useful_prefetches": useful,
+        "unused_prefetches": unused_evicted + sum(resident.values()),
+        "accuracy": useful / issued if issued else 0.0,
+        "coverage": useful / (useful + demand_faults) if useful + demand_faults else 0.0,
+        "prefetch_evictions": prefetch_evictions,
+        "polluting_evictions": polluting,
+        "hit_miss": hit_miss,
+    }
+
+
+def compare_prefetchers(pages, capacity, policies=PREFETCH_POLICIES, prefetchers=tuple(PREFETCHERS), degree=1):
+    # One row per (policy, prefetcher), with the demand-paged run as baseline
+    results = []
+    for policy in policies:
+        baseline = simulate_prefetch(pages, capacity, policy)["page_faults"]
+        for name in prefetchers:
+            result = simulate_prefetch(pages, capacity, policy, make_prefetcher(name, degree))
+            del result["hit_miss"]
+            result["prefetcher"] = name
+            result["baseline_faults"] = baseline
+            results.append(result)
+    return results
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from cost_model import simulate_costs, POLICIES
+from shards import spatial_hash
+
+# -------------------------
+# Set-Associative Simulation
+# -------------------------
+# Memory is split into `sets` independent sets of `ways` frames. A page can
+# only live in set index(page), so the trace is partitioned by set with one
+# stable sort and every set is simulated on its own sub-trace, in parallel
+# across worker processes. Per-reference results are scattered back into
+# trace order afterwards.
+#   modulo: set = page % sets
+#   hash:   set = splitmix64(page) % sets (spreads strided access patterns)
+SET_INDEXING = ("modulo", "hash")
+
+
+def set_indices(pages, sets, indexing="modulo"):
+    if indexing not in SET_INDEXING:
+        raise ValueError(f"Unknown set indexing '{indexing}', expected one of {', '.join(SET_INDEXING)}")
+    pages = np.asarray(pages, dtype=np.int64)
+    if indexing == "modulo":
+        return pages % sets
+    return (spatial_hash(pages) % np.uint64(sets)).astype(np.int64)
+
+
+def partition_trace(pages, sets, indexing="modulo"):
+    # Returns (order, bounds): pages[order[bounds[s]:bounds[s + 1]]] is the
+    # sub-trace of set s, in original reference order
+    indices = set_indices(pages, sets, indexing)
+    order = np.argsort(indices, kind="stable")
+    bounds = np.zeros(sets + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=sets), out=bounds[1:])
+    return order, bounds
+
+
+def _simulate_sets(task):
+    # Worker: simulates a batch of sets and returns their miss flags
+    policy, ways, latencies, batch = task
+    results = []
+    for set_id, pages, writes in batch:
+        cost = simulate_costs(pages, writes, ways, policy, compact=True, **latencies)
+        misses = np.fromiter((outcome == "Miss" for outcome in cost["hit_miss"]), dtype=bool, count=len(pages))
+        results.append((set_id, misses, cost["write_backs"]))
+    return results
+
+
+def simulate_set_associative(pages, sets, ways, policy="LRU", writes=None, indexing="modulo",
+                             workers=None, **latencies):
+    if policy not in POLICIES:
+        raise ValueError(f"Invalid policy '{policy}', expected one of {', '.join(POLICIES)}")
+    if sets <= 0 or ways <= 0:
+        raise ValueError("Sets and ways must be positive")
+    pages = np.asarray(pages, dtype=np.int64)
+    writes = np.zeros(len(pages), dtype=bool) if writes is None else np.asarray(writes, dtype=bool)
+    order, bounds = partition_trace(pages, sets, indexing)
+    sorted_pages = pages[order]
+    sorted_writes = writes[order]
+
+    jobs = [(s, sorted_pages[bounds[s]:bounds[s + 1]].tolist(), sorted_writes[bounds[s]:bounds[s + 1]].tolist())
+            for s in range(sets) if bounds[s + 1] > bounds[s]]
+    workers = workers or os.cpu_count() or 1
+    # A few batches per worker keeps every core busy without one task per set
+    batch_count = max(min(len(jobs), workers * 4), 1)
+    tasks = [(policy, ways, latencies, jobs[i::batch_count]) for i in range(batch_count)]
+
+    if workers == 1 or len(tasks) == 1:
+        results = map(_simulate_sets, tasks)
+        outcomes = [item for batch in results for item in batch]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = [item for batch in pool.map(_simulate_sets, tasks) for item in batch]
+
+    sorted_misses = np.zeros(len(pages), dtype=bool)
+    set_faults = np.zeros(sets, dtype=np.int64)
+    write_backs = 0
+    for set_id, misses, set_write_backs in outcomes:
+        sorted_misses[bounds[set_id]:bounds[set_id + 1]] = misses
+        set_faults[set_id] = misses.sum()
+        write_backs += set_write_backs
+    misses = np.empty(len(pages), dtype=bool)
+    misses[order] = sorted_misses
+
+    return {
+        "policy": policy,
+        "sets": sets,
+        "ways": ways,
+        "references": len(pages),
+        "page_faults": int(set_faults.sum()),
+        "write_backs": write_backs,
+        "misses": misses,
+        "set_faults": set_faults,
+        "set_references": np.diff(bounds),
+    }
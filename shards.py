@@ -0,0 +1,203 @@
+import heapq
+import math
+from bisect import bisect_left
+import numpy as np
+from locality import StackDistanceTracker
+
+# -------------------------
+# Spatially-Hashed Sampling (SHARDS)
+# -------------------------
+# Pages are hashed and only those whose hash falls under a threshold T are
+# simulated, so the sample rate is R = T / P. LRU stack distances measured on
+# the sample are scaled by 1 / R to estimate full-trace distances.
+#   fixed-rate: T is constant
+#   fixed-size: at most max_pages sampled pages are tracked; when the limit is
+#               exceeded the page with the largest hash is dropped and T is
+#               lowered to its hash, which bounds memory regardless of trace size
+# Sampled pages are also split into independent hash groups; the spread of the
+# per-group curves gives the reported error bound.
+HASH_MODULUS = 1 << 24
+DEFAULT_RATE = 0.01
+DEFAULT_GROUPS = 8
+
+
+def spatial_hash(pages):
+    # splitmix64 finaliser over a whole array of page numbers
+    x = np.asarray(pages).astype(np.int64).view(np.uint64)
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class _Histogram:
+    # Reuse-distance histogram in full-trace units: every sample adds 1 / R
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.counts = {}
+        self.cold = 0.0
+        self.weight = 0.0
+
+    def add(self, distance, rate):
+        weight = self.scale / rate
+        self.weight += weight
+        if distance is None:
+            self.cold += weight
+        else:
+            key = int(distance * self.scale / rate)
+            self.counts[key] = self.counts.get(key, 0.0) + weight
+
+    def adjusted(self, references):
+        # SHARDS_adj: credit the gap between expected and observed sample
+        # weight to the smallest distances so the curve is not biased by
+        # lucky or unlucky hash draws of very hot pages. A deficit is added to
+        # the smallest distance; a surplus (a hot page was sampled) is taken
+        # from the smallest distances upwards, carrying past the buckets it
+        # empties, so the total stays the reference count. Returns (keys,
+        # prefix sums, total, largest key the surplus was taken from or -1)
+        keys = sorted(self.counts)
+        counts = [self.counts[key] for key in keys]
+        adjustment = references - self.weight
+        reached = -1
+        if counts and adjustment >= 0:
+            counts[0] += adjustment
+        else:
+            for index, count in enumerate(counts):
+                taken = min(count, -adjustment)
+                counts[index] -= taken
+                adjustment += taken
+                reached = keys[index]
+                if adjustment >= 0:
+                    break
+        prefix = [0.0]
+        for count in counts:
+            prefix.append(prefix[-1] + count)
+        if adjustment < 0:
+            # Surplus larger than every sampled reuse: it comes out of the
+            # cold misses and no capacity is covered
+            reached = float("inf")
+        total = prefix[-1] + max(self.cold + min(adjustment, 0.0), 0.0)
+        return keys, prefix, total, reached
+
+    def miss_ratios(self, capacities, references):
+        if not references:
+            return [0.0] * len(capacities)
+        keys, prefix, total, _ = self.adjusted(references)
+        if total <= 0:
+            return [0.0] * len(capacities)
+        return [min(max(1.0 - prefix[bisect_left(keys, capacity)] / total, 0.0), 1.0)
+                for capacity in capacities]
+
+
+class ShardsSampler:
+    def __init__(self, rate=None, max_pages=None, groups=DEFAULT_GROUPS):
+        if rate is None:
+            rate = DEFAULT_RATE if max_pages is None else 1.0
+        if not 0 < rate <= 1:
+            raise ValueError("Sampling rate must be in (0, 1]")
+        if max_pages is not None and max_pages <= 0:
+            raise ValueError("max_pages must be positive")
+        self.threshold = int(rate * HASH_MODULUS)
+        self.max_pages = max_pages
+        self.groups = max(int(groups), 1)
+        self.references = 0
+        self.sampled_references = 0
+
+        self.tracker = StackDistanceTracker()
+        self.histogram = _Histogram()
+        self.group_trackers = [StackDistanceTracker() for _ in range(self.groups)]
+        self.group_histograms = [_Histogram(self.groups) for _ in range(self.groups)]
+        self.largest = []
+
+    @property
+    def rate(self):
+        return self.threshold / HASH_MODULUS
+
+    def feed(self, pages):
+        pages = np.asarray(pages)
+        self.references += len(pages)
+        hashes = spatial_hash(pages)
+        values = (hashes & np.uint64(HASH_MODULUS - 1)).astype(np.int64)
+        # Vectorised pre-filter; the threshold only ever decreases, so anything
+        # rejected here would be rejected in the loop as well
+        keep = np.flatnonzero(values < self.threshold)
+        groups = ((hashes[keep] >> np.uint64(40)) % np.uint64(self.groups)).tolist()
+        for page, value, group in zip(pages[keep].tolist(), values[keep].tolist(), groups):
+            self._sample(page, value, group)
+
+    def _sample(self, page, value, group):
+        if value >= self.threshold:
+            return
+        tracked = page in self.tracker.last
+        if self.max_pages is not None and not tracked:
+            heapq.heappush(self.largest, (-value, page, group))
+        rate = self.rate
+        self.sampled_references += 1
+        self.histogram.add(self.tracker.access(page), rate)
+        self.group_histograms[group].add(self.group_trackers[group].access(page), rate)
+
+        if self.max_pages is not None and len(self.tracker.last) > self.max_pages:
+            # Drop the page(s) with the largest hash and lower the threshold
+            negative, victim, victim_group = heapq.heappop(self.largest)
+            self.threshold = -negative
+            self.tracker.remove(victim)
+            self.group_trackers[victim_group].remove(victim)
+            while self.largest and -self.largest[0][0] >= self.threshold:
+                _, victim, victim_group = heapq.heappop(self.largest)
+                self.tracker.remove(victim)
+                self.group_trackers[victim_group].remove(victim)
+
+    def curve(self, capacities=None, points=50):
+        if capacities is None:
+            largest = max(self.histogram.counts, default=0) + 1
+            step = max(largest // points, 1)
+            capacities = list(range(step, largest + step, step))
+        capacities = [int(capacity) for capacity in capacities]
+        miss_ratio = self.histogram.miss_ratios(capacities, self.references)
+
+        # Below `resolved_capacity` the estimate is only an upper limit:
+        # sampled distances are scaled in steps of 1 / R, and a surplus taken
+        # from the smallest distances (a heavy hitter in the sample) empties
+        # their buckets. There the bound reaches down to a miss ratio of 0
+        _, _, _, reached = self.histogram.adjusted(self.references)
+        resolved = max(math.ceil(1 / self.rate), reached + 1)
+        error_bound = [0.0] * len(capacities)
+        if self.groups > 1:
+            # Each group is an independent sample at rate R / groups; the
+            # standard error of their mean approximates the error of the full
+            # sample, reported as a two-sigma band
+            group_curves = np.array([histogram.miss_ratios(capacities, self.references)
+                                     for histogram in self.group_histograms])
+            spread = group_curves.std(axis=0, ddof=1) / np.sqrt(self.groups)
+            error_bound = (2 * spread).tolist()
+        for index, capacity in enumerate(capacities):
+            if capacity < resolved:
+                error_bound[index] = max(error_bound[index], miss_ratio[index])
+
+        return {
+            "capacities": capacities,
+            "miss_ratio": miss_ratio,
+            "error_bound": error_bound,
+            "references": self.references,
+            "sampled_references": self.sampled_references,
+            "sampled_pages": len(self.tracker.last),
+            "rate": self.rate,
+            "resolved_capacity": resolved,
+        }
+
+
+def shards_mrc(pages, capacities=None, rate=None, max_pages=None, groups=DEFAULT_GROUPS):
+    # pages may be a single list/array or an iterable of chunks, such as
+    # trace_ingest.iter_trace_chunks output
+    sampler = ShardsSampler(rate, max_pages, groups)
+    if isinstance(pages, (list, np.ndarray)):
+        sampler.feed(pages)
+    else:
+        for chunk in pages:
+            sampler.feed(chunk[0] if isinstance(chunk, tuple) else chunk)
+    return sampler.curve(capacities)
+
+
+def exact_lru_mrc(pages, capacities=None):
+    # Unsampled LRU miss-ratio curve, useful to validate sampled curves
+    return shards_mrc(pages, capacities, rate=1.0, groups=1)
@@ -0,0 +1,245 @@
+import json
+import os
+import zipfile
+import numpy as np
+from engine_hooks import ChainedHooks, EngineHooks, run_instrumented
+
+# -------------------------
+# Columnar Per-Step Export
+# -------------------------
+# Writes one row per reference with numeric columns:
+#   index (int64), page (int64), hit (bool), victim (int64, -1 = no eviction),
+#   cumulative_faults (int64) and optionally frames (capacity x int64, -1 = empty
+#   slot, same frame order as the engines)
+# Rows are produced by an engine hook and written every `chunk_size` references,
+# so memory stays bounded for any trace length.
+#   parquet: one row group per chunk (needs pyarrow)
+#   npz:     deflated NumPy archive with one entry per column and chunk,
+#            e.g. "page/000003.npy"; works with NumPy alone
+EXPORT_FORMATS = ("parquet", "npz")
+DEFAULT_CHUNK_SIZE = 1 << 20
+COLUMNS = ("index", "page", "hit", "victim", "cumulative_faults")
+
+
+def _as_path(sink):
+    # str / os.PathLike paths -> str; file objects are returned unchanged
+    return os.fsdecode(sink) if isinstance(sink, (str, bytes, os.PathLike)) else sink
+
+
+def _export_format(sink, fmt):
+    if fmt is None:
+        fmt = "parquet" if isinstance(sink, str) and sink.endswith(".parquet") else "npz"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+class _ParquetChunkWriter:
+    def __init__(self, sink, metadata, capacity, include_frames):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow); use the npz format instead")
+        self.pa = pa
+        self.capacity = capacity
+        fields = [pa.field("index", pa.int64()), pa.field("page", pa.int64()), pa.field("hit", pa.bool_()),
+                  pa.field("victim", pa.int64()), pa.field("cumulative_faults", pa.int64())]
+        if include_frames:
+            fields.append(pa.field("frames", pa.list_(pa.int64(), capacity)))
+        self.schema = pa.schema(fields, metadata={"simulation": json.dumps(metadata)})
+        self.writer = pq.ParquetWriter(sink, self.schema)
+
+    def write(self, columns):
+        pa = self.pa
+        arrays = [pa.array(columns[name]) for name in COLUMNS]
+        if "frames" in columns:
+            arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(columns["frames"].ravel()), self.capacity))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class _NpzChunkWriter:
+    def __init__(self, sink, metadata, capacity, include_frames):
+        self.archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+        self.archive.writestr("metadata.json", json.dumps(metadata))
+        self.chunks = 0
+
+    def write(self, columns):
+        for name, values in columns.items():
+            with self.archive.open(f"{name}/{self.chunks:06d}.npy", "w", force_zip64=True) as entry:
+                np.lib.format.write_array(entry, values, allow_pickle=False)
+        self.chunks += 1
+
+    def close(self):
+        self.archive.close()
+
+
+class StepRecorder(EngineHooks):
+    # Collects per-reference rows from the engine events and hands them to a
+    # chunk writer. Frame state is rebuilt from the same events: misses
+    # append, evictions free the victim's slot (Optimal refills it in place,
+    # FIFO/LRU keep queue order) and LRU hits move the page to the back.
+    def __init__(self, writer, policy, capacity, include_frames=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.writer = writer
+        self.in_place = policy == "Optimal"
+        self.recency = policy.startswith("LRU")
+        self.capacity = capacity
+        self.include_frames = include_frames
+        self.chunk_size = chunk_size
+        self.frame = []
+        self.faults = 0
+        self.rows = 0
+        self._reset()
+
+    def _reset(self):
+        self.pages = []
+        self.hits = []
+        self.evicted_rows = []
+        self.victims = []
+        self.frames = []
+
+    def _next_row(self):
+        # The previous row is complete once the next event arrives, so its
+        # frame state (after any eviction) is taken here
+        if self.include_frames and len(self.frames) < len(self.pages):
+            self.frames.append(self.frame + [-1] * (self.capacity - len(self.frame)))
+        if len(self.pages) >= self.chunk_size:
+            self.flush()
+
+    def on_hit(self, index, page):
+        self._next_row()
+        if self.include_frames and self.recency:
+            self.frame.remove(page)
+            self.frame.append(page)
+        self.pages.append(page)
+        self.hits.append(True)
+
+    def on_miss(self, index, page):
+        self._next_row()
+        if self.include_frames:
+            self.frame.append(page)
+        self.pages.append(page)
+        self.hits.append(False)
+
+    def on_evict(self, index, victim, residency):
+        self.evicted_rows.append(len(self.pages) - 1)
+        self.victims.append(victim)
+        if self.include_frames:
+            page = self.frame.pop()
+            if self.in_place:
+                self.frame[self.frame.index(victim)] = page
+            else:
+                self.frame.remove(victim)
+                self.frame.append(page)
+
+    def on_end(self):
+        self._next_row()
+        self.flush()
+
+    def flush(self):
+        if not self.pages:
+            return
+        count = len(self.pages)
+        hits = np.array(self.hits, dtype=bool)
+        victims = np.full(count, -1, dtype=np.int64)
+        victims[self.evicted_rows] = self.victims
+        cumulative = self.faults + np.cumsum(~hits, dtype=np.int64)
+        columns = {
+            "index": np.arange(self.rows, self.rows + count, dtype=np.int64),
+            "page": np.array(self.pages, dtype=np.int64),
+            "hit": hits,
+            "victim": victims,
+            "cumulative_faults": cumulative,
+        }
+        if self.include_frames:
+            columns["frames"] = np.array(self.frames, dtype=np.int64).reshape(count, self.capacity)
+        self.writer.write(columns)
+        self.rows += count
+        self.faults = int(cumulative[-1])
+        self._reset()
+
+
+def export_steps(sink, policy, pages, capacity, writes=None, fmt=None, include_frames=False,
+                 chunk_size=DEFAULT_CHUNK_SIZE, initial_frame=None, clean_window=None, hooks=None):
+    # sink is a path or a binary file object (fmt is then required, or npz is
+    # used). Returns the run summary without the per-reference lists.
+    if clean_window is None:
+        # Same default window as cost_model.simulate_costs
+        clean_window = max(capacity // 2, 1) if policy.endswith("-Clean") else 0
+    sink = _as_path(sink)
+    fmt = _export_format(sink, fmt)
+    metadata = {"policy": policy, "capacity": capacity, "references": len(pages)}
+    writer_class = _ParquetChunkWriter if fmt == "parquet" else _NpzChunkWriter
+    writer = writer_class(sink, metadata, capacity, include_frames)
+    try:
+        recorder = StepRecorder(writer, policy, capacity, include_frames, chunk_size)
+        recorder.frame = list(initial_frame or [])
+        result = run_instrumented(policy, pages, capacity, ChainedHooks(recorder, hooks), writes, initial_frame,
+                                  clean_window, record_steps=False)
+    finally:
+        writer.close()
+    del result["hit_miss"], result["response_times"], result["steps"]
+    result["policy"] = policy
+    result["references"] = len(pages)
+    result["format"] = fmt
+    return result
+
+
+def export_recorded_steps(sink, policy, pages, capacity, steps, hit_miss, fmt=None, include_frames=False,
+                          chunk_size=DEFAULT_CHUNK_SIZE):
+    # Same file as export_steps, built from the frame states and "Hit"/"Miss"
+    # lists of a finished run (e.g. a CheckpointedRun) instead of simulating
+    # again. The victim of a miss is the page that left the frame.
+    sink = _as_path(sink)
+    fmt = _export_format(sink, fmt)
+    metadata = {"policy": policy, "capacity": capacity, "references": len(pages)}
+    writer_class = _ParquetChunkWriter if fmt == "parquet" else _NpzChunkWriter
+    writer = writer_class(sink, metadata, capacity, include_frames)
+    try:
+        recorder = StepRecorder(writer, policy, capacity, include_frames, chunk_size)
+        previous = ()
+        for index, (page, frame, outcome) in enumerate(zip(pages, steps, hit_miss)):
+            if outcome == "Hit":
+                recorder.on_hit(index, page)
+            else:
+                recorder.on_miss(index, page)
+                if len(previous) >= capacity:
+                    victim, = set(previous).difference(frame)
+                    recorder.on_evict(index, victim, None)
+            previous = frame
+        recorder.on_end()
+    finally:
+        writer.close()
+    return {"policy": policy, "references": len(pages), "page_faults": hit_miss.count("Miss"), "format": fmt}
+
+
+def default_export_format():
+    # Parquet when pyarrow is installed, the NumPy archive otherwise
+    from importlib.util import find_spec
+    return "parquet" if find_spec("pyarrow") else "npz"
+
+
+def load_steps(source, fmt=None):
+    # Reads an export back into {column: array} (frames as a 2-D array)
+    source = _as_path(source)
+    fmt = _export_format(source, fmt)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(source)
+        columns = {name: table.column(name).to_numpy() for name in COLUMNS}
+        if "frames" in table.column_names:
+            frames = table.column("frames").combine_chunks()
+            columns["frames"] = frames.flatten().to_numpy().reshape(len(frames), frames.type.list_size)
+        return columns
+    with zipfile.ZipFile(source) as archive:
+        chunks = {}
+        for name in sorted(archive.namelist()):
+            if name.endswith(".npy"):
+                with archive.open(name) as entry:
+                    chunks.setdefault(name.split("/", 1)[0], []).append(np.lib.format.read_array(entry))
+    for name in COLUMNS:
+        chunks.setdefault(name, [np.empty(0, dtype=bool if name == "hit" else np.int64)])
+    return {name: np.concatenate(parts) for name, parts in chunks.items()}
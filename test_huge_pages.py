@@ -0,0 +1,26 @@
+from huge_pages import BASE_PAGE_SIZE, simulate_huge_pages
+
+# Huge pages of 4 base pages; density 0.5 promotes a region on its 2nd page
+HUGE_SIZE = 4 * BASE_PAGE_SIZE
+
+
+def test_promotion_counts_seen_base_pages_as_touched():
+    # Page 1 promotes region 0 after pages 0 and 1: 2 of 4 base pages unused
+    result = simulate_huge_pages([0, 1], HUGE_SIZE, "LRU", 0.5, huge_size=HUGE_SIZE)
+    assert result["promotions"] == 1
+    assert result["peak_internal_fragmentation"] == 2 * BASE_PAGE_SIZE
+    assert result["mean_internal_fragmentation"] == (0 + 2 * BASE_PAGE_SIZE) / 2
+
+
+def test_fragmentation_shrinks_as_huge_page_is_used():
+    result = simulate_huge_pages([0, 1, 2, 3, 1], HUGE_SIZE, "FIFO", 0.5, huge_size=HUGE_SIZE)
+    fragmentation = [0, 2, 1, 0, 0]
+    assert result["page_faults"] == 2
+    assert result["mean_internal_fragmentation"] == sum(fragmentation) * BASE_PAGE_SIZE / 5
+
+
+def test_without_promotion_there_is_no_fragmentation():
+    result = simulate_huge_pages([0, 1, 2, 3], HUGE_SIZE, "Optimal", None, huge_size=HUGE_SIZE)
+    assert result["page_faults"] == 4
+    assert result["promotions"] == 0
+    assert result["peak_internal_fragmentation"] == 0
@@ -0,0 +1,212 @@
+import heapq
+from collections import OrderedDict
+from cost_model import DEFAULT_MEMORY_LATENCY, DEFAULT_DISK_LATENCY
+from engine_hooks import next_use_table
+from locality import reuse_distance_histogram
+
+# -------------------------
+# Two-Tier Memory (fast tier + slow tier)
+# -------------------------
+# Pages live in a fast tier (e.g. DRAM), a slow tier (e.g. CXL/NVM memory) or
+# only on disk. Tiers are exclusive. Per-tier accounting:
+#   fast hit -> fast_latency, slow hit -> slow_latency, fault -> disk_latency
+# Placement policies (all O(1) per reference except the Optimal bound):
+#   LRU:      every access promotes to the fast tier; the fast tier's LRU page is
+#             demoted to the slow tier, whose LRU page goes back to disk
+#   Hotness:  new pages fill free fast frames, otherwise land in the slow tier;
+#             a slow page is promoted after `promote_threshold` hits within
+#             `hot_window` references (fast LRU page demoted in exchange)
+#   Optimal:  bound from Belady's algorithm with bypass (a referenced page
+#             need not stay in a tier, as Hotness serves slow hits without
+#             touching the fast tier). It keeps the pages used soonest, so
+#             OPT(F) contents are always a subset of OPT(F + S) contents: fast
+#             hits are OPT(F) hits and faults are OPT(F + S) misses. It has no
+#             migration counts.
+TIER_POLICIES = ("LRU", "Hotness", "Optimal")
+DEFAULT_SLOW_LATENCY = 300
+DEFAULT_PROMOTE_THRESHOLD = 2
+DEFAULT_HOT_WINDOW = 1024
+
+
+def _lru_tiers(pages, fast_capacity, slow_capacity):
+    fast = OrderedDict()
+    slow = OrderedDict()
+    fast_hits = slow_hits = faults = promotions = demotions = evictions = 0
+    for page in pages:
+        if page in fast:
+            fast.move_to_end(page)
+            fast_hits += 1
+            continue
+        if page in slow:
+            del slow[page]
+            slow_hits += 1
+            promotions += 1
+        else:
+            faults += 1
+        if len(fast) >= fast_capacity:
+            demoted, _ = fast.popitem(last=False)
+            if slow_capacity:
+                slow[demoted] = None
+                demotions += 1
+                if len(slow) > slow_capacity:
+                    slow.popitem(last=False)
+                    evictions += 1
+            else:
+                evictions += 1
+        fast[page] = None
+    return fast_hits, slow_hits, faults, promotions, demotions, evictions
+
+
+def _hotness_tiers(pages, fast_capacity, slow_capacity, promote_threshold, hot_window):
+    fast = OrderedDict()
+    slow = OrderedDict()
+    heat = {}  # slow page -> (hits, index of the first counted hit)
+    fast_hits = slow_hits = faults = promotions = demotions = evictions = 0
+
+    def demote_fast_lru():
+        nonlocal demotions, evictions
+        demoted, _ = fast.popitem(last=False)
+        if not slow_capacity:
+            evictions += 1
+            return
+        if len(slow) >= slow_capacity:
+            victim, _ = slow.popitem(last=False)
+            heat.pop(victim, None)
+            evictions += 1
+        slow[demoted] = None
+        demotions += 1
+
+    for i, page in enumerate(pages):
+        if page in fast:
+            fast.move_to_end(page)
+            fast_hits += 1
+            continue
+        if page in slow:
+            slow_hits += 1
+            slow.move_to_end(page)
+            hits, first = heat.get(page, (0, i))
+            if i - first > hot_window:
+                hits, first = 0, i
+            hits += 1
+            if hits < promote_threshold:
+                heat[page] = (hits, first)
+                continue
+            del slow[page]
+            heat.pop(page, None)
+            promotions += 1
+            if len(fast) >= fast_capacity:
+                demote_fast_lru()
+            fast[page] = None
+            continue
+
+        faults += 1
+        if len(fast) < fast_capacity or not slow_capacity:
+            if len(fast) >= fast_capacity:
+                demote_fast_lru()
+            fast[page] = None
+        else:
+            if len(slow) >= slow_capacity:
+                victim, _ = slow.popitem(last=False)
+                heat.pop(victim, None)
+                evictions += 1
+            slow[page] = None
+    return fast_hits, slow_hits, faults, promotions, demotions, evictions
+
+
+def _belady_hits(pages, next_use, capacity):
+    # Per-reference hit flags of Belady's OPT (with bypass) in O(log n) per reference: a
+    # max-heap on (next use, page) with stale entries skipped lazily
+    resident = {}
+    heap = []
+    hits = bytearray(len(pages))
+    for i, page in enumerate(pages):
+        hits[i] = page in resident
+        resident[page] = next_use[i]
+        heapq.heappush(heap, (-next_use[i], page))
+        if len(resident) > capacity:
+            # May be the page just referenced (bypass)
+            while True:
+                negative_use, victim = heapq.heappop(heap)
+                if resident.get(victim) == -negative_use:
+                    break
+            del resident[victim]
+    return hits
+
+
+def _optimal_tiers(pages, fast_capacity, slow_capacity):
+    next_use = next_use_table(pages)
+    fast_hits = sum(_belady_hits(pages, next_use, fast_capacity))
+    total_hits = sum(_belady_hits(pages, next_use, fast_capacity + slow_capacity))
+    return fast_hits, total_hits - fast_hits, len(pages) - total_hits, None, None, None
+
+
+def _tier_result(policy, pages, fast_capacity, slow_capacity, counts, fast_latency, slow_latency, disk_latency):
+    fast_hits, slow_hits, faults, promotions, demotions, evictions = counts
+    references = len(pages)
+    average_access_time = 0.0
+    if references:
+        average_access_time = (fast_hits * fast_latency + slow_hits * slow_latency
+                               + faults * disk_latency) / references
+    return {
+        "policy": policy,
+        "fast_capacity": fast_capacity,
+        "slow_capacity": slow_capacity,
+        "references": references,
+        "fast_hits": fast_hits,
+        "slow_hits": slow_hits,
+        "page_faults": faults,
+        "promotions": promotions,
+        "demotions": demotions,
+        "evictions": evictions,
+        "fast_hit_ratio": fast_hits / references if references else 0.0,
+        "average_access_time": average_access_time,
+    }
+
+
+def simulate_tiers(pages, fast_capacity, slow_capacity, policy="LRU", fast_latency=DEFAULT_MEMORY_LATENCY,
+                   slow_latency=DEFAULT_SLOW_LATENCY, disk_latency=DEFAULT_DISK_LATENCY,
+                   promote_threshold=DEFAULT_PROMOTE_THRESHOLD, hot_window=DEFAULT_HOT_WINDOW):
+    if policy not in TIER_POLICIES:
+        raise ValueError(f"Invalid tier policy '{policy}', expected one of {', '.join(TIER_POLICIES)}")
+    if fast_capacity <= 0 or slow_capacity < 0:
+        raise ValueError("Fast tier must be positive and slow tier non-negative")
+    pages = list(pages)
+    if policy == "LRU":
+        counts = _lru_tiers(pages, fast_capacity, slow_capacity)
+    elif policy == "Hotness":
+        counts = _hotness_tiers(pages, fast_capacity, slow_capacity, promote_threshold, hot_window)
+    else:
+        counts = _optimal_tiers(pages, fast_capacity, slow_capacity)
+    return _tier_result(policy, pages, fast_capacity, slow_capacity, counts, fast_latency, slow_latency, disk_latency)
+
+
+def fast_tier_sweep(pages, fast_sizes, slow_capacity, policy="LRU", fast_latency=DEFAULT_MEMORY_LATENCY,
+                    slow_latency=DEFAULT_SLOW_LATENCY, disk_latency=DEFAULT_DISK_LATENCY, **options):
+    # One result per fast-tier size. LRU tiering behaves like a single LRU
+    # stack (fast tier = top F entries), so its whole sweep comes from one
+    # reuse-distance histogram; the other policies are simulated per size
+    pages = list(pages)
+    latencies = (fast_latency, slow_latency, disk_latency)
+    if policy != "LRU":
+        return [simulate_tiers(pages, size, slow_capacity, policy, *latencies, **options) for size in fast_sizes]
+    histogram, cold = reuse_distance_histogram(pages)
+    distances = sorted(histogram.items())
+    results = []
+    for size in fast_sizes:
+        if size <= 0:
+            raise ValueError("Fast tier must be positive")
+        fast_hits = sum(count for distance, count in distances if distance < size)
+        total_hits = sum(count for distance, count in distances if distance < size + slow_capacity)
+        counts = (fast_hits, total_hits - fast_hits, len(pages) - total_hits, None, None, None)
+        results.append(_tier_result(policy, pages, size, slow_capacity, counts, *latencies))
+    return results
+
+
+def required_fast_tier(sweep, slack=0.05):
+    # Smallest fast tier whose average access time is within `slack` of the
+    # best one in the sweep
+    if not sweep:
+        return None
+    best = min(result["average_access_time"] for result in sweep)
+    fitting = [result["fast_capacity"] for result in sweep if result["average_access_time"] <= best * (1 + slack)]
+    return min(fitting)
@@ -0,0 +1,270 @@
+import os
+import sys
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# -------------------------
+# Trace Formats and Page Sizes
+# -------------------------
+# Supported inputs:
+#   "lackey" - Valgrind lackey output ("I  0400d7d4,8", " S 7ff000398,8", ...)
+#   "hex"    - one address per line, optional "0x" prefix and optional
+#              "R "/"W " access-type prefix ("W 0x7ffd1234")
+PAGE_SIZES = {"4K": 4 * 1024, "2M": 2 * 1024 * 1024, "1G": 1024 * 1024 * 1024}
+TRACE_FORMATS = ("auto", "lackey", "hex")
+
+# Compact trace files are a flat array of these records
+TRACE_DTYPE = np.dtype([("page", "<u8"), ("write", "u1")])
+COMPACT_SUFFIX = ".ptrace"
+
+CHUNK_BYTES = 64 * 1024 * 1024
+
+# Lookup table from byte value to hex digit value (255 = not a hex digit)
+_HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+for _value, _char in enumerate(b"0123456789abcdef"):
+    _HEX_VALUES[_char] = _value
+for _value, _char in enumerate(b"ABCDEF"):
+    _HEX_VALUES[_char] = 10 + _value
+
+
+def page_shift(page_size):
+    # Accepts "4K"/"2M"/"1G" or a byte count and returns log2(page size)
+    if isinstance(page_size, str):
+        key = page_size.strip().upper()
+        if key not in PAGE_SIZES:
+            raise ValueError(f"Unknown page size '{page_size}', expected one of {', '.join(PAGE_SIZES)}")
+        page_size = PAGE_SIZES[key]
+    page_size = int(page_size)
+    if page_size <= 0 or page_size & (page_size - 1):
+        raise ValueError(f"Page size must be a power of two, got {page_size}")
+    return page_size.bit_length() - 1
+
+
+def detect_format(block):
+    # The first data line decides; lackey lines have the access type in a fixed
+    # column. Returns None while the block holds no data line (only blank,
+    # "#" or "==pid==" lines), so the caller can wait for more input
+    start = 0
+    while start < len(block):
+        end = block.find(b"\n", start)
+        if end < 0:
+            end = len(block)
+        line = block[start:end].rstrip(b"\r")
+        start = end + 1
+        if not line or line.startswith(b"==") or line.startswith(b"#"):
+            continue
+        if line.startswith(b"I  ") or line[:3] in (b" L ", b" S ", b" M "):
+            return "lackey"
+        return "hex"
+    return None
+
+
+# -------------------------
+# Vectorised Block Parsing
+# -------------------------
+def _hex_fields_to_int(data, starts, ends, line_numbers):
+    lengths = ends - starts
+    if not len(lengths):
+        return np.empty(0, dtype=np.uint64)
+    bad = (lengths <= 0) | (lengths > 16)
+    if bad.any():
+        raise ValueError(f"Malformed address on trace line {line_numbers[np.argmax(bad)] + 1}")
+
+    # Fields of equal width are gathered together as rows of a strided view,
+    # so only the address bytes are translated to digit values. Each group is
+    # right-aligned in a 16-digit grid, digit pairs are packed into bytes and
+    # each row is read as a big-endian word
+    addresses = np.empty(len(lengths), dtype=np.uint64)
+    first_bad = None
+    for length in np.flatnonzero(np.bincount(lengths, minlength=17)).tolist():
+        rows = np.flatnonzero(lengths == length)
+        digits = np.zeros((len(rows), 16), dtype=np.uint8)
+        digits[:, 16 - length:] = _HEX_VALUES[sliding_window_view(data, length)[starts[rows]]]
+        bad = (digits[:, 16 - length:] == 255).any(axis=1)
+        if bad.any():
+            row = rows[np.argmax(bad)]
+            first_bad = row if first_bad is None else min(first_bad, row)
+        addresses[rows] = ((digits[:, 0::2] << 4) | digits[:, 1::2]).view(">u8").ravel()
+    if first_bad is not None:
+        raise ValueError(f"Malformed address on trace line {line_numbers[first_bad] + 1}")
+    return addresses
+
+
+def _split_lines(data):
+    # Returns start/end (exclusive, without "\r") of every line in a block
+    # that ends with a newline
+    ends = np.flatnonzero(data == 10)
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    has_cr = (ends > starts) & (data[np.maximum(ends - 1, 0)] == 13)
+    return starts, ends - has_cr
+
+
+def _parse_lackey(data, starts, ends, line_numbers, include_instructions):
+    first = data[starts]
+    op = np.where(first == ord(" "), data[np.minimum(starts + 1, len(data) - 1)], first)
+    is_data = (ends - starts >= 5) & np.isin(op, np.frombuffer(b"ILSM", dtype=np.uint8))
+    is_data &= (first == ord("I")) | (first == ord(" "))
+    if not include_instructions:
+        is_data &= op != ord("I")
+    starts, ends, op, line_numbers = starts[is_data], ends[is_data], op[is_data], line_numbers[is_data]
+
+    # The address runs from column 3 up to the comma before the access size.
+    # Sizes have one or two digits, so that comma is looked up right before
+    # the end of the line; other lines fall back to the first comma found in
+    # the block. A stray comma inside the address makes the line malformed
+    field_ends = np.full(len(starts), -1, dtype=np.int64)
+    for digits in (1, 2):
+        candidates = ends - digits - 1
+        found = (field_ends < 0) & (candidates > starts + 3) & (data[np.maximum(candidates, 0)] == ord(","))
+        field_ends[found] = candidates[found]
+    missing = np.flatnonzero(field_ends < 0)
+    if len(missing):
+        commas = np.flatnonzero(data == ord(","))
+        owner = np.searchsorted(starts, commas, side="right") - 1
+        valid = (owner >= 0) & (commas < ends[np.maximum(owner, 0)])
+        commas, owner = commas[valid], owner[valid]
+        first_commas = np.full(len(starts), -1, dtype=np.int64)
+        first_commas[owner[::-1]] = commas[::-1]
+        field_ends[missing] = first_commas[missing]
+    if (field_ends < 0).any():
+        raise ValueError(f"Missing access size on trace line {line_numbers[np.argmax(field_ends < 0)] + 1}")
+
+    addresses = _hex_fields_to_int(data, starts + 3, field_ends, line_numbers)
+    writes = (op == ord("S")) | (op == ord("M"))
+    return addresses, writes
+
+
+def _parse_hex(data, starts, ends, line_numbers):
+    # Skips blank, "#" comment and Valgrind "==pid==" lines
+    last = len(data) - 1
+    first = data[starts]
+    valgrind = (first == ord("=")) & (data[np.minimum(starts + 1, last)] == ord("="))
+    keep = (ends > starts) & (first != ord("#")) & ~valgrind
+    starts, ends, line_numbers = starts[keep], ends[keep], line_numbers[keep]
+
+    first = data[starts] | 0x20
+    has_op = ((first == ord("r")) | (first == ord("w"))) & (data[np.minimum(starts + 1, last)] == ord(" "))
+    writes = has_op & (first == ord("w"))
+    field_starts = starts + 2 * has_op
+    has_prefix = (data[np.minimum(field_starts, last)] == ord("0")) & (
+        (data[np.minimum(field_starts + 1, last)] | 0x20) == ord("x")
+    )
+    field_starts = field_starts + 2 * has_prefix
+
+    addresses = _hex_fields_to_int(data, field_starts, ends, line_numbers)
+    return addresses, writes
+
+
+def parse_block(block, fmt="hex", page_size="4K", include_instructions=True, first_line=0):
+    # Parses a block of complete lines into (page numbers, write flags)
+    data = np.frombuffer(block, dtype=np.uint8)
+    starts, ends = _split_lines(data)
+    line_numbers = np.arange(first_line, first_line + len(starts), dtype=np.int64)
+    if fmt == "lackey":
+        addresses, writes = _parse_lackey(data, starts, ends, line_numbers, include_instructions)
+    elif fmt == "hex":
+        addresses, writes = _parse_hex(data, starts, ends, line_numbers)
+    else:
+        raise ValueError(f"Unknown trace format '{fmt}'")
+    pages = addresses >> np.uint64(page_shift(page_size))
+    return pages, writes
+
+
+# -------------------------
+# Chunked Ingestion
+# -------------------------
+def iter_trace_chunks(source, fmt="auto", page_size="4K", include_instructions=True, chunk_bytes=CHUNK_BYTES):
+    # Yields (pages, writes) array pairs; source is a path, "-" for stdin,
+    # or an open binary file
+    if fmt not in TRACE_FORMATS:
+        raise ValueError(f"Unknown trace format '{fmt}', expected one of {', '.join(TRACE_FORMATS)}")
+    page_shift(page_size)
+
+    if source == "-":
+        handle, owned = sys.stdin.buffer, False
+    elif isinstance(source, (str, os.PathLike)):
+        handle, owned = open(source, "rb"), True
+    else:
+        handle, owned = source, False
+
+    try:
+        carry = b""
+        line_base = 0
+        while True:
+            block = handle.read(chunk_bytes)
+            if not block:
+                break
+            block = carry + block
+            cut = block.rfind(b"\n") + 1
+            block, carry = block[:cut], block[cut:]
+            if not block:
+                continue
+            if fmt == "auto":
+                # Keep buffering header-only blocks until a data line shows
+                # the format
+                detected = detect_format(block)
+                if detected is None:
+                    carry = block + carry
+                    continue
+                fmt = detected
+            yield parse_block(block, fmt, page_size, include_instructions, line_base)
+            line_base += block.count(b"\n")
+        if carry.strip():
+            if fmt == "auto":
+                fmt = detect_format(carry) or "hex"
+            yield parse_block(carry + b"\n", fmt, page_size, include_instructions, line_base)
+    finally:
+        if owned:
+            handle.close()
+
+
+def load_address_trace(source, fmt="auto", page_size="4K", include_instructions=True, chunk_bytes=CHUNK_BYTES):
+    pages, writes = [], []
+    for chunk_pages, chunk_writes in iter_trace_chunks(source, fmt, page_size, include_instructions, chunk_bytes):
+        pages.append(chunk_pages)
+        writes.append(chunk_writes)
+    if not pages:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=bool)
+    return np.concatenate(pages), np.concatenate(writes)
+
+
+# -------------------------
+# Compact Trace Files
+# -------------------------
+def write_compact_trace(source, destination, fmt="auto", page_size="4K", include_instructions=True,
+                        chunk_bytes=CHUNK_BYTES):
+    # Streams an address log into a flat binary file of TRACE_DTYPE records
+    count = 0
+    with open(destination, "wb") as out:
+        for pages, writes in iter_trace_chunks(source, fmt, page_size, include_instructions, chunk_bytes):
+            records = np.empty(len(pages), dtype=TRACE_DTYPE)
+            records["page"] = pages
+            records["write"] = writes
+            records.tofile(out)
+            count += len(records)
+    return count
+
+
+def load_compact_trace(path, mmap=True):
+    if os.path.getsize(path) % TRACE_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a compact trace file")
+    if mmap and os.path.getsize(path):
+        records = np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+    else:
+        records = np.fromfile(path, dtype=TRACE_DTYPE)
+    return records["page"], records["write"].astype(bool)
+
+
+def load_trace(source, fmt="auto", page_size="4K", include_instructions=True):
+    # Compact trace files are recognised by their suffix, anything else is parsed
+    if isinstance(source, (str, os.PathLike)) and str(source).endswith(COMPACT_SUFFIX):
+        return load_compact_trace(source)
+    return load_address_trace(source, fmt, page_size, include_instructions)
+
+
+def feed_engine(engine, source, capacity, fmt="auto", page_size="4K", include_instructions=True):
+    # Runs one of the page_replacement engines directly on an address trace
+    pages, _ = load_trace(source, fmt, page_size, include_instructions)
+    return engine(pages.tolist(), capacity)
@@ -0,0 +1,155 @@
+from engine_hooks import EngineHooks, ChainedHooks
+from page_replacement import lru_page_replacement
+
+# -------------------------
+# Translation Front-End
+# -------------------------
+# Every reference is first translated through a set-associative TLB. A TLB
+# miss walks an N-level radix page table; a walk that finds the page
+# non-resident is a page fault and the frame decision is taken by the wrapped
+# FIFO/LRU/Optimal engine. Evicted pages are shot down from the TLB.
+# Latencies are in nanoseconds.
+DEFAULT_TLB_ENTRIES = 64
+DEFAULT_TLB_WAYS = 4
+DEFAULT_LEVELS = 4
+DEFAULT_BITS_PER_LEVEL = 9
+
+
+class _VictimRecorder(EngineHooks):
+    # Victim of every reference (None on hits and cold misses)
+    def __init__(self, references):
+        self.victims = [None] * references
+
+    def on_evict(self, index, victim, residency):
+        self.victims[index] = victim
+
+
+class SetAssociativeTLB:
+    def __init__(self, entries=DEFAULT_TLB_ENTRIES, ways=DEFAULT_TLB_WAYS):
+        if entries <= 0 or ways <= 0 or entries % ways:
+            raise ValueError("TLB entries must be a positive multiple of the associativity")
+        self.ways = ways
+        self.sets = entries // ways
+        # Flat arrays indexed by set * ways + way; -1 marks an empty entry
+        self.tags = [-1] * entries
+        self.stamps = [0] * entries
+        self.clock = 0
+
+    def lookup(self, page):
+        self.clock += 1
+        base = (page % self.sets) * self.ways
+        try:
+            slot = self.tags.index(page, base, base + self.ways)
+        except ValueError:
+            return False
+        self.stamps[slot] = self.clock
+        return True
+
+    def fill(self, page):
+        base = (page % self.sets) * self.ways
+        stamps = self.stamps
+        victim = min(range(base, base + self.ways), key=stamps.__getitem__)
+        self.tags[victim] = page
+        stamps[victim] = self.clock
+
+    def invalidate(self, page):
+        base = (page % self.sets) * self.ways
+        try:
+            slot = self.tags.index(page, base, base + self.ways)
+        except ValueError:
+            return
+        self.tags[slot] = -1
+        self.stamps[slot] = 0
+
+
+class RadixPageTable:
+    # Each node is a list of 2 ** bits_per_level child slots (None = not
+    # allocated), indexed by that level's bits of the page number, so page
+    # numbers are limited to levels * bits_per_level bits
+    def __init__(self, levels=DEFAULT_LEVELS, bits_per_level=DEFAULT_BITS_PER_LEVEL):
+        if levels <= 0 or bits_per_level <= 0:
+            raise ValueError("Page table needs at least one level and one index bit per level")
+        self.levels = levels
+        self.bits = levels * bits_per_level
+        self.mask = (1 << bits_per_level) - 1
+        # Shift that turns a page number into the index within its node at
+        # each level (level 0 is the root)
+        self.shifts = [bits_per_level * (levels - 1 - level) for level in range(levels)]
+        self.root = [None] * (self.mask + 1)
+        self.nodes = 1
+
+    def walk(self, page):
+        # Number of page-table entries read; the walk stops at the first level
+        # whose next node has not been allocated yet
+        if page >> self.bits:
+            raise ValueError(f"Page {page} does not fit in a {self.bits}-bit page table")
+        node = self.root
+        for level in range(1, self.levels):
+            node = node[(page >> self.shifts[level - 1]) & self.mask]
+            if node is None:
+                return level
+        return self.levels
+
+    def map(self, page):
+        # Allocates the path to a page when its fault is serviced
+        node = self.root
+        for level in range(1, self.levels):
+            index = (page >> self.shifts[level - 1]) & self.mask
+            if node[index] is None:
+                node[index] = [None] * (self.mask + 1)
+                self.nodes += 1
+            node = node[index]
+
+    def node_count(self):
+        return self.nodes
+
+
+def simulate_translation(pages, capacity, engine=lru_page_replacement,
+                         tlb_entries=DEFAULT_TLB_ENTRIES, tlb_ways=DEFAULT_TLB_WAYS,
+                         levels=DEFAULT_LEVELS, bits_per_level=DEFAULT_BITS_PER_LEVEL,
+                         tlb_latency=1, memory_latency=100, disk_latency=8_000_000, hooks=None):
+    # The engine reports its evictions through hooks; any caller hooks see the
+    # same events
+    recorder = _VictimRecorder(len(pages))
+    faults, steps, hit_miss, _, _, _ = engine(pages, capacity, hooks=ChainedHooks(recorder, hooks))
+    victims = recorder.victims
+
+    tlb = SetAssociativeTLB(tlb_entries, tlb_ways)
+    table = RadixPageTable(levels, bits_per_level)
+    tlb_hits = 0
+    walks = 0
+    walk_reads = 0
+
+    for i, page in enumerate(pages):
+        if tlb.lookup(page):
+            tlb_hits += 1
+        else:
+            walks += 1
+            walk_reads += table.walk(page)
+            if hit_miss[i] == "Miss":
+                table.map(page)
+                if victims[i] is not None:
+                    tlb.invalidate(victims[i])
+            tlb.fill(page)
+
+    total = len(pages)
+    tlb_misses = total - tlb_hits
+    effective_access_time = 0.0
+    if total:
+        effective_access_time = (
+            tlb_latency
+            + memory_latency
+            + walk_reads * memory_latency / total
+            + faults * disk_latency / total
+        )
+    return {
+        "references": total,
+        "tlb_hits": tlb_hits,
+        "tlb_misses": tlb_misses,
+        "tlb_hit_rate": tlb_hits / total if total else 0.0,
+        "page_walks": walks,
+        "walk_memory_reads": walk_reads,
+        "page_faults": faults,
+        "page_table_nodes": table.node_count(),
+        "effective_access_time": effective_access_time,
+    }